@@ -29,10 +29,11 @@ export default function AdminPage() {
     setResultMessage(null);
 
     try {
-      const response = await webApi.request<{ status: string; recomputed: number }>("/admin/rankings/recompute", {
-        method: "POST",
-      });
-      setResultMessage(`Rankings recomputed: ${response.recomputed}`);
+      const response = await webApi.request<{ status: string; recomputed: number; jobId: string }>(
+        "/admin/rankings/recompute",
+        { method: "POST" },
+      );
+      setResultMessage(`Recompute ${response.status} (job ${response.jobId})`);
     } catch (err) {
       setResultMessage(err instanceof Error ? err.message : "No se pudo recomputar rankings");
     } finally {
@@ -40,6 +41,23 @@ export default function AdminPage() {
     }
   }
 
+  async function onRefreshCapacities() {
+    setWorking(true);
+    setResultMessage(null);
+
+    try {
+      const response = await webApi.request<{ status: string; refreshedAthletes: number; jobId: string }>(
+        "/admin/capacities/refresh",
+        { method: "POST" },
+      );
+      setResultMessage(`Refresh ${response.status} (job ${response.jobId})`);
+    } catch (err) {
+      setResultMessage(err instanceof Error ? err.message : "No se pudo refrescar capacidades");
+    } finally {
+      setWorking(false);
+    }
+  }
+
   async function onCreateMovement(event: FormEvent<HTMLFormElement>) {
     event.preventDefault();
     setWorking(true);
@@ -91,6 +109,18 @@ export default function AdminPage() {
           </CardContent>
         </Card>
 
+        <Card>
+          <CardHeader>
+            <CardTitle>Capacidades</CardTitle>
+            <CardDescription>Recalcula capacidades y pulse de todos los atletas</CardDescription>
+          </CardHeader>
+          <CardContent>
+            <Button onClick={onRefreshCapacities} disabled={working}>
+              Refresh capacities
+            </Button>
+          </CardContent>
+        </Card>
+
         <Card>
           <CardHeader>
             <CardTitle>Crear movimiento</CardTitle>
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from src.adapters.outbound.persistence.models.enums import (
+    AttemptStatus,
+    DataQuality,
+    LeaderboardPeriod,
+    LeaderboardScope,
+    LevelBand,
+    ScaleCode,
+)
+from src.application.services.leaderboard_index import (
+    LeaderboardCandidate,
+    SortedLeaderboard,
+)
+from src.application.services.runtime_service import (
+    AthleteProfileRecord,
+    RuntimeService,
+    WorkoutAttemptRecord,
+    WorkoutResultRecord,
+    _now,
+)
+
+BENCH_WORKOUT_ID = "bench-workout"
+ATTEMPTS_PER_ATHLETE = 4
+TOP_K = 50
+
+
+def _populate(service: RuntimeService, attempt_count: int) -> None:
+    gym_id = next(iter(service.gyms))
+    now = _now()
+    athlete_ids: list[str] = []
+    for index in range(max(1, attempt_count // ATTEMPTS_PER_ATHLETE)):
+        profile = AthleteProfileRecord(
+            id=str(uuid4()),
+            user_id=f"bench-user-{index}",
+            current_gym_id=gym_id,
+            sex=None,
+            birthdate=None,
+            height_cm=None,
+            weight_kg=None,
+            level=1,
+            level_band=LevelBand.BEGINNER,
+            created_at=now,
+        )
+        service._add_athlete_profile(profile)
+        athlete_ids.append(profile.id)
+
+    for index in range(attempt_count):
+        attempt = WorkoutAttemptRecord(
+            id=str(uuid4()),
+            athlete_id=athlete_ids[index % len(athlete_ids)],
+            workout_definition_id=BENCH_WORKOUT_ID,
+            assignment_id=None,
+            performed_at=now - timedelta(minutes=index),
+            scale_code=ScaleCode.RX,
+            status=AttemptStatus.VALIDATED,
+        )
+        service._add_result(
+            WorkoutResultRecord(
+                id=str(uuid4()),
+                attempt_id=attempt.id,
+                primary_result_json={},
+                inputs_json={},
+                derived_metrics_json={},
+                score_base=float(index % 500),
+                score_norm=float((index * 37) % 1000) / 10,
+                data_quality=DataQuality.OK,
+                validated_by_user_id=None,
+                validated_at=now,
+                reject_reason=None,
+            )
+        )
+        service._add_attempt(attempt)
+
+
+# Reference full scan the service used before leaderboards were indexed; kept here as the baseline.
+def _scan_leaderboard(service: RuntimeService, workout_id: str, scale_code: ScaleCode) -> SortedLeaderboard:
+    best_by_athlete: dict[str, LeaderboardCandidate] = {}
+    for attempt in service._validated_attempts(workout_id, scale_code):
+        result = service._result_by_attempt(attempt.id)
+        if result is None or attempt.athlete_id not in service.athlete_profiles:
+            continue
+        candidate = LeaderboardCandidate(
+            attempt_id=attempt.id,
+            athlete_id=attempt.athlete_id,
+            score_norm=result.score_norm,
+            performed_at=attempt.performed_at,
+        )
+        current_best = best_by_athlete.get(attempt.athlete_id)
+        if current_best is None or candidate.preference_key < current_best.preference_key:
+            best_by_athlete[attempt.athlete_id] = candidate
+
+    board = SortedLeaderboard()
+    for candidate in best_by_athlete.values():
+        board.upsert(candidate)
+    return board
+
+
+def _time_leaderboard(service: RuntimeService, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        service._leaderboard_to_dto(
+            _scan_leaderboard(service, BENCH_WORKOUT_ID, ScaleCode.RX),
+            BENCH_WORKOUT_ID,
+            LeaderboardScope.COMMUNITY,
+            LeaderboardPeriod.ALL_TIME,
+            ScaleCode.RX,
+            None,
+        )
+    return (time.perf_counter() - started) / repeats
+
+
+def _time_indexed_leaderboard(service: RuntimeService, repeats: int) -> float:
+    key = (BENCH_WORKOUT_ID, LeaderboardScope.COMMUNITY, None, LeaderboardPeriod.ALL_TIME, ScaleCode.RX)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        service._leaderboard_to_dto(
+            service._leaderboard_index.board(key),
+            BENCH_WORKOUT_ID,
+            LeaderboardScope.COMMUNITY,
+            LeaderboardPeriod.ALL_TIME,
+            ScaleCode.RX,
+            None,
+            limit=TOP_K,
+        )
+    return (time.perf_counter() - started) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Leaderboard latency vs validated attempt count")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    service = RuntimeService()
+    baseline = service.snapshot()
+    print(f"{'attempts':>10} {'ms':>10} {'us/attempt':>12} {'top-k ms':>12}")
+    for size in args.sizes:
+        service.restore(baseline)
+        _populate(service, size)
+        elapsed = _time_leaderboard(service, args.repeats)
+        indexed = _time_indexed_leaderboard(service, args.repeats)
+        print(f"{size:>10} {elapsed * 1000:>10.2f} {elapsed * 1_000_000 / size:>12.2f} {indexed * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from src.adapters.outbound.persistence.models.enums import (
+    AttemptStatus,
+    DataQuality,
+    LevelBand,
+    ScaleCode,
+    ScoreType,
+    UserRole,
+    WorkoutType,
+    WorkoutVisibility,
+)
+from src.application.services.runtime_service import (
+    AthleteProfileRecord,
+    GymRecord,
+    RuntimeService,
+    WorkoutAttemptRecord,
+    WorkoutDefinitionRecord,
+    WorkoutResultRecord,
+    WorkoutScaleRecord,
+    _now,
+)
+
+
+def _populate(service: RuntimeService, *, athletes: int, workouts: int, gyms: int, attempts: int) -> None:
+    rng = random.Random(7)
+    now = _now()
+    gym_ids = list(service.gyms)
+    for index in range(gyms - len(gym_ids)):
+        gym = GymRecord(id=str(uuid4()), name=f"Bench Gym {index}", created_at=now)
+        service.gyms[gym.id] = gym
+        gym_ids.append(gym.id)
+
+    athlete_ids: list[str] = []
+    for index in range(athletes):
+        profile = AthleteProfileRecord(
+            id=str(uuid4()),
+            user_id=f"bench-user-{index}",
+            current_gym_id=gym_ids[index % len(gym_ids)],
+            sex=None,
+            birthdate=None,
+            height_cm=None,
+            weight_kg=None,
+            level=1,
+            level_band=LevelBand.BEGINNER,
+            created_at=now,
+        )
+        service._add_athlete_profile(profile)
+        athlete_ids.append(profile.id)
+
+    workout_ids: list[str] = []
+    for index in range(workouts):
+        workout_id = str(uuid4())
+        service.workouts[workout_id] = WorkoutDefinitionRecord(
+            id=workout_id,
+            title=f"Bench Workout {index}",
+            description="",
+            author_coach_user_id="bench-coach",
+            is_test=False,
+            type=WorkoutType.AMRAP,
+            visibility=WorkoutVisibility.COMMUNITY,
+            score_type=ScoreType.REPS,
+            created_at=now,
+            published_at=now,
+            updated_at=now,
+            scales=[
+                WorkoutScaleRecord(
+                    id=str(uuid4()),
+                    workout_definition_id=workout_id,
+                    code=code,
+                    label=code.value,
+                    notes="",
+                    reference_loads_json={},
+                )
+                for code in (ScaleCode.RX, ScaleCode.SCALED)
+            ],
+        )
+        workout_ids.append(workout_id)
+
+    for _ in range(attempts):
+        attempt = WorkoutAttemptRecord(
+            id=str(uuid4()),
+            athlete_id=rng.choice(athlete_ids),
+            workout_definition_id=rng.choice(workout_ids),
+            assignment_id=None,
+            performed_at=now - timedelta(hours=rng.randint(0, 24 * 90)),
+            scale_code=rng.choice((ScaleCode.RX, ScaleCode.SCALED)),
+            status=AttemptStatus.VALIDATED,
+        )
+        service._add_result(
+            WorkoutResultRecord(
+                id=str(uuid4()),
+                attempt_id=attempt.id,
+                primary_result_json={},
+                inputs_json={},
+                derived_metrics_json={},
+                score_base=0.0,
+                score_norm=rng.uniform(0.0, 100.0),
+                data_quality=DataQuality.OK,
+                validated_by_user_id=None,
+                validated_at=now,
+                reject_reason=None,
+            )
+        )
+        service._add_attempt(attempt)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full recompute_rankings wall time")
+    parser.add_argument("--athletes", type=int, default=10_000)
+    parser.add_argument("--workouts", type=int, default=500)
+    parser.add_argument("--gyms", type=int, default=20)
+    parser.add_argument("--attempts", type=int, default=100_000)
+    args = parser.parse_args()
+
+    service = RuntimeService()
+    admin = next(user for user in service.users.values() if user.role == UserRole.ADMIN)
+    _populate(service, athletes=args.athletes, workouts=args.workouts, gyms=args.gyms, attempts=args.attempts)
+
+    started = time.perf_counter()
+    response = service.recompute_rankings(admin)
+    elapsed = time.perf_counter() - started
+    print(f"recomputed {response.recomputed} leaderboards over {args.attempts} attempts in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 
 from src.adapters.inbound.http.deps import current_user_dep, runtime_service_dep
 from src.adapters.inbound.http.errors import to_http_exception
 from src.application.dtos.admin import (
+    AdminCacheStatsResponseDTO,
+    AdminCapacityRefreshResponseDTO,
     AdminChangeGymRequestDTO,
     AdminChangeGymResponseDTO,
     AdminCreateMovementRequestDTO,
@@ -43,10 +45,65 @@ async def admin_change_athlete_gym(
 
 @router.post("/rankings/recompute", response_model=RecomputeRankingsResponseDTO)
 async def admin_recompute_rankings(
+    background_tasks: BackgroundTasks,
     service: Annotated[RuntimeService, Depends(runtime_service_dep)],
     current_user: Annotated[UserRecord, Depends(current_user_dep)],
 ) -> RecomputeRankingsResponseDTO:
     try:
-        return service.recompute_rankings(current_user)
+        job = service.start_rankings_recompute(current_user)
+    except ServiceError as exc:
+        raise to_http_exception(exc) from exc
+    if job.status == "queued" and job.job_id is not None:
+        background_tasks.add_task(service.run_rankings_recompute, job.job_id)
+    return job
+
+
+@router.get("/rankings/recompute/{job_id}", response_model=RecomputeRankingsResponseDTO)
+async def admin_recompute_rankings_status(
+    job_id: str,
+    service: Annotated[RuntimeService, Depends(runtime_service_dep)],
+    current_user: Annotated[UserRecord, Depends(current_user_dep)],
+) -> RecomputeRankingsResponseDTO:
+    try:
+        return service.get_rankings_recompute_job(current_user, job_id)
+    except ServiceError as exc:
+        raise to_http_exception(exc) from exc
+
+
+@router.post("/capacities/refresh", response_model=AdminCapacityRefreshResponseDTO)
+async def admin_refresh_capacities(
+    background_tasks: BackgroundTasks,
+    service: Annotated[RuntimeService, Depends(runtime_service_dep)],
+    current_user: Annotated[UserRecord, Depends(current_user_dep)],
+    gym_id: Annotated[str | None, Query(alias="gymId")] = None,
+) -> AdminCapacityRefreshResponseDTO:
+    try:
+        job = service.start_capacity_refresh(current_user, gym_id)
+    except ServiceError as exc:
+        raise to_http_exception(exc) from exc
+    if job.status == "queued":
+        background_tasks.add_task(service.run_capacity_refresh, job.job_id)
+    return job
+
+
+@router.get("/cache-stats", response_model=AdminCacheStatsResponseDTO)
+async def admin_cache_stats(
+    service: Annotated[RuntimeService, Depends(runtime_service_dep)],
+    current_user: Annotated[UserRecord, Depends(current_user_dep)],
+) -> AdminCacheStatsResponseDTO:
+    try:
+        return service.get_cache_stats(current_user)
+    except ServiceError as exc:
+        raise to_http_exception(exc) from exc
+
+
+@router.get("/capacities/refresh/{job_id}", response_model=AdminCapacityRefreshResponseDTO)
+async def admin_refresh_capacities_status(
+    job_id: str,
+    service: Annotated[RuntimeService, Depends(runtime_service_dep)],
+    current_user: Annotated[UserRecord, Depends(current_user_dep)],
+) -> AdminCapacityRefreshResponseDTO:
+    try:
+        return service.get_capacity_refresh_job(current_user, job_id)
     except ServiceError as exc:
         raise to_http_exception(exc) from exc
@@ -14,6 +14,7 @@ from src.application.dtos.auth import (
     RefreshResponseDTO,
     RegisterFromInviteRequestDTO,
     RegisterFromInviteResponseDTO,
+    SessionDTO,
 )
 from src.application.dtos.common import StatusResponseDTO
 from src.application.services.runtime_service import RuntimeService, ServiceError, UserRecord
@@ -27,7 +28,7 @@ async def login(
     service: Annotated[RuntimeService, Depends(runtime_service_dep)],
 ) -> LoginResponseDTO:
     try:
-        return service.login(payload.email, payload.password)
+        return await service.login(payload.email, payload.password)
     except ServiceError as exc:
         raise to_http_exception(exc) from exc
 
@@ -56,6 +57,17 @@ async def logout(
         raise to_http_exception(exc) from exc
 
 
+@router.get("/sessions", response_model=list[SessionDTO])
+async def list_sessions(
+    service: Annotated[RuntimeService, Depends(runtime_service_dep)],
+    current_user: Annotated[UserRecord, Depends(current_user_dep)],
+) -> list[SessionDTO]:
+    try:
+        return service.list_sessions(current_user)
+    except ServiceError as exc:
+        raise to_http_exception(exc) from exc
+
+
 @router.post("/invitations", response_model=InviteCreateResponseDTO)
 async def create_invitation(
     payload: InviteCreateRequestDTO,
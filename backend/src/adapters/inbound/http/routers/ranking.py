@@ -15,17 +15,39 @@ def ranking_query_dep(
     scope: Annotated[str, Query()],
     period: Annotated[str, Query()],
     scale_code: Annotated[str, Query(alias="scaleCode")],
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> RankingQueryDTO:
-    return RankingQueryDTO(workoutId=workout_id, scope=scope, period=period, scaleCode=scale_code)
+    return RankingQueryDTO(
+        workoutId=workout_id,
+        scope=scope,
+        period=period,
+        scaleCode=scale_code,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
 
 
+# Sync so FastAPI runs it in the threadpool: concurrent misses for one page then wait on the
+# leaderboard cache's single-flight lock instead of each rebuilding the page.
 @router.get("/api/v1/rankings", response_model=LeaderboardDTO)
-async def get_rankings(
+def get_rankings(
     query: Annotated[RankingQueryDTO, Depends(ranking_query_dep)],
     service: Annotated[RuntimeService, Depends(runtime_service_dep)],
     current_user: Annotated[UserRecord | None, Depends(current_user_optional_dep)],
 ) -> LeaderboardDTO:
     try:
-        return service.get_rankings(query.workout_id, query.scope, query.period, query.scale_code, current_user)
+        return service.get_rankings(
+            query.workout_id,
+            query.scope,
+            query.period,
+            query.scale_code,
+            current_user,
+            limit=query.limit,
+            offset=query.offset,
+            cursor=query.cursor,
+        )
     except ServiceError as exc:
         raise to_http_exception(exc) from exc
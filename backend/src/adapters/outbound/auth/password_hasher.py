@@ -1,12 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
 
 class PasswordHasher:
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = 4) -> None:
         self._context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # bcrypt releases the GIL, so a bounded thread pool runs hashes in parallel
+        # without blocking the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
 
     def hash(self, password: str) -> str:
         return self._context.hash(password)
 
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        return list(self._executor.map(self.hash, passwords))
+
     def verify(self, plain_password: str, hashed_password: str) -> bool:
         return self._context.verify(plain_password, hashed_password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.verify, plain_password, hashed_password)
@@ -1,4 +1,7 @@
 from src.application.dtos.admin import (
+    AdminCacheStatsDTO,
+    AdminCacheStatsResponseDTO,
+    AdminCapacityRefreshResponseDTO,
     AdminChangeGymRequestDTO,
     AdminChangeGymResponseDTO,
     AdminCreateMovementRequestDTO,
@@ -23,6 +26,7 @@ from src.application.dtos.auth import (
     RefreshResponseDTO,
     RegisterFromInviteRequestDTO,
     RegisterFromInviteResponseDTO,
+    SessionDTO,
 )
 from src.application.dtos.coach import (
     CoachAthleteDetailDTO,
@@ -55,6 +59,9 @@ from src.application.dtos.ranking import (
 )
 
 __all__ = [
+    "AdminCacheStatsDTO",
+    "AdminCacheStatsResponseDTO",
+    "AdminCapacityRefreshResponseDTO",
     "AdminChangeGymRequestDTO",
     "AdminChangeGymResponseDTO",
     "AdminCreateMovementRequestDTO",
@@ -90,6 +97,7 @@ __all__ = [
     "RegisterFromInviteRequestDTO",
     "RegisterFromInviteResponseDTO",
     "RejectAttemptRequestDTO",
+    "SessionDTO",
     "SubmitResultRequestDTO",
     "StatusResponseDTO",
     "ValidateAttemptResponseDTO",
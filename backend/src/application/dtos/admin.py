@@ -25,3 +25,24 @@ class AdminChangeGymResponseDTO(DTOModel):
     athlete_id: str = Field(alias="athleteId")
     previous_gym_id: str | None = Field(default=None, alias="previousGymId")
     current_gym_id: str = Field(alias="currentGymId")
+
+
+class AdminCapacityRefreshResponseDTO(DTOModel):
+    status: str
+    job_id: str = Field(alias="jobId")
+    gym_id: str | None = Field(default=None, alias="gymId")
+    processed_gyms: int = Field(default=0, alias="processedGyms")
+    total_gyms: int = Field(default=0, alias="totalGyms")
+    refreshed_athletes: int = Field(default=0, alias="refreshedAthletes")
+    error: str | None = None
+
+
+class AdminCacheStatsDTO(DTOModel):
+    entries: int
+    hits: int
+    misses: int
+
+
+class AdminCacheStatsResponseDTO(DTOModel):
+    access_tokens: AdminCacheStatsDTO = Field(alias="accessTokens")
+    leaderboards: AdminCacheStatsDTO
@@ -1,6 +1,6 @@
 from typing import Annotated, Literal
 
-from pydantic import Field
+from pydantic import ConfigDict, Field
 
 from src.application.dtos.base import DTOModel
 from src.adapters.outbound.persistence.models.enums import (
@@ -54,6 +54,8 @@ class SubmitResultRequestDTO(DTOModel):
 
 
 class CapacityImpactDTO(DTOModel):
+    model_config = ConfigDict(frozen=True)
+
     strength: float
     muscular_endurance: float = Field(alias="muscularEndurance")
     relative_strength: float = Field(alias="relativeStrength")
@@ -61,6 +63,8 @@ class CapacityImpactDTO(DTOModel):
 
 
 class CapacityImpactMovementSplitDTO(DTOModel):
+    model_config = ConfigDict(frozen=True)
+
     movement_id: str = Field(alias="movementId")
     block_id: str = Field(alias="blockId")
     block_ord: int = Field(alias="blockOrd")
@@ -69,12 +73,16 @@ class CapacityImpactMovementSplitDTO(DTOModel):
 
 
 class CapacityImpactBlockSplitDTO(DTOModel):
+    model_config = ConfigDict(frozen=True)
+
     block_id: str = Field(alias="blockId")
     block_ord: int = Field(alias="blockOrd")
     impact: CapacityImpactDTO
 
 
 class CapacityImpactBreakdownDTO(DTOModel):
+    model_config = ConfigDict(frozen=True)
+
     total: CapacityImpactDTO
     by_movement: list[CapacityImpactMovementSplitDTO] = Field(default_factory=list, alias="byMovement")
     by_block: list[CapacityImpactBlockSplitDTO] = Field(default_factory=list, alias="byBlock")
@@ -31,6 +31,12 @@ class LogoutRequestDTO(DTOModel):
     refresh_token: str | None = Field(default=None, alias="refreshToken")
 
 
+class SessionDTO(DTOModel):
+    id: str
+    created_at: str = Field(alias="createdAt")
+    expires_at: str = Field(alias="expiresAt")
+
+
 class InviteCreateRequestDTO(DTOModel):
     email: EmailStr
     gym_id: str = Field(alias="gymId")
@@ -9,6 +9,9 @@ class RankingQueryDTO(DTOModel):
     scope: LeaderboardScope
     period: LeaderboardPeriod
     scale_code: ScaleCode = Field(alias="scaleCode")
+    limit: int | None = Field(default=None, ge=1, le=500)
+    offset: int = Field(default=0, ge=0)
+    cursor: str | None = None
 
 
 class LeaderboardEntryDTO(DTOModel):
@@ -25,8 +28,15 @@ class LeaderboardDTO(DTOModel):
     scale_code: ScaleCode = Field(alias="scaleCode")
     entries: list[LeaderboardEntryDTO]
     my_rank: int | None = Field(default=None, alias="myRank")
+    total: int = 0
+    next_cursor: str | None = Field(default=None, alias="nextCursor")
+    neighbors: list[LeaderboardEntryDTO] = Field(default_factory=list)
 
 
 class RecomputeRankingsResponseDTO(DTOModel):
     status: str
     recomputed: int
+    job_id: str | None = Field(default=None, alias="jobId")
+    processed_workouts: int = Field(default=0, alias="processedWorkouts")
+    total_workouts: int = Field(default=0, alias="totalWorkouts")
+    error: str | None = None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class CachedAccessToken:
+    user_id: str
+    expires_at: float
+    claims: dict[str, Any]
+
+
+class AccessTokenCache:
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CachedAccessToken] = OrderedDict()
+        self._tokens_by_user: dict[str, set[str]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str, now: float) -> CachedAccessToken | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                self._remove(token, entry)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, entry: CachedAccessToken) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(token, None)
+            if previous is not None:
+                self._discard_user_token(previous.user_id, token)
+            self._entries[token] = entry
+            self._tokens_by_user.setdefault(entry.user_id, set()).add(token)
+            while len(self._entries) > self._max_entries:
+                oldest_token, oldest = self._entries.popitem(last=False)
+                self._discard_user_token(oldest.user_id, oldest_token)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, token: str, entry: CachedAccessToken) -> None:
+        del self._entries[token]
+        self._discard_user_token(entry.user_id, token)
+
+    def _discard_user_token(self, user_id: str, token: str) -> None:
+        user_tokens = self._tokens_by_user.get(user_id)
+        if user_tokens is None:
+            return
+        user_tokens.discard(token)
+        if not user_tokens:
+            del self._tokens_by_user[user_id]
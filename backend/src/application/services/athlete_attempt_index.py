@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src.adapters.outbound.persistence.models.enums import AttemptStatus
+
+if TYPE_CHECKING:
+    from src.application.services.runtime_service import WorkoutAttemptRecord
+
+
+class AthleteAttemptIndex:
+    def __init__(self) -> None:
+        self._by_athlete: dict[str, dict[AttemptStatus, list[tuple[datetime, str]]]] = {}
+
+    def add(self, attempt: WorkoutAttemptRecord) -> None:
+        buckets = self._by_athlete.setdefault(attempt.athlete_id, {})
+        insort(buckets.setdefault(attempt.status, []), (attempt.performed_at, attempt.id))
+
+    def move(self, attempt: WorkoutAttemptRecord, previous_status: AttemptStatus) -> None:
+        if previous_status == attempt.status:
+            return
+        buckets = self._by_athlete.get(attempt.athlete_id, {})
+        bucket = buckets.get(previous_status, [])
+        entry = (attempt.performed_at, attempt.id)
+        position = bisect_left(bucket, entry)
+        if position < len(bucket) and bucket[position] == entry:
+            del bucket[position]
+        self.add(attempt)
+
+    def attempt_ids(self, athlete_id: str, status: AttemptStatus) -> list[str]:
+        return [attempt_id for _, attempt_id in self._bucket(athlete_id, status)]
+
+    def count(self, athlete_id: str, status: AttemptStatus) -> int:
+        return len(self._bucket(athlete_id, status))
+
+    def count_since(self, athlete_id: str, status: AttemptStatus, since: datetime) -> int:
+        bucket = self._bucket(athlete_id, status)
+        return len(bucket) - bisect_left(bucket, (since, ""))
+
+    def _bucket(self, athlete_id: str, status: AttemptStatus) -> list[tuple[datetime, str]]:
+        return self._by_athlete.get(athlete_id, {}).get(status, [])
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+
+from src.adapters.outbound.persistence.models.enums import CapacityType
+
+CAPACITY_TREND_WINDOW = timedelta(days=30)
+
+
+# Trends only need the latest value written at or before now - 30d. Entries are appended in time order
+# and the read threshold only moves forward, so everything older than that baseline is dropped.
+class CapacityHistory:
+    def __init__(self, window: timedelta = CAPACITY_TREND_WINDOW) -> None:
+        self._window = window
+        self._entries: dict[tuple[str, CapacityType], deque[tuple[datetime, float]]] = {}
+
+    def append(self, athlete_id: str, capacity_type: CapacityType, recorded_at: datetime, value: float) -> None:
+        entries = self._entries.setdefault((athlete_id, capacity_type), deque())
+        entries.append((recorded_at, value))
+        self._trim(entries, recorded_at - self._window)
+
+    def baseline(self, athlete_id: str, capacity_type: CapacityType, now: datetime) -> float | None:
+        entries = self._entries.get((athlete_id, capacity_type))
+        if not entries:
+            return None
+        threshold = now - self._window
+        self._trim(entries, threshold)
+        recorded_at, value = entries[0]
+        return value if recorded_at <= threshold else None
+
+    def entries(self, athlete_id: str, capacity_type: CapacityType) -> list[tuple[datetime, float]]:
+        return list(self._entries.get((athlete_id, capacity_type), ()))
+
+    @staticmethod
+    def _trim(entries: deque[tuple[datetime, float]], threshold: datetime) -> None:
+        while len(entries) > 1 and entries[1][0] <= threshold:
+            entries.popleft()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.adapters.outbound.persistence.models.enums import CapacityType
+
+CAPACITY_DECAY_DAYS = 60.0
+CAPACITY_EMA_ALPHA = 0.3
+
+
+def _days_between(start: datetime, end: datetime) -> float:
+    return (end - start).total_seconds() / 86400.0
+
+
+def decayed_values(
+    anchor: datetime, scaled_ema: Mapping[CapacityType, float], now: datetime
+) -> dict[CapacityType, float]:
+    factor = math.exp(-_days_between(anchor, now) / CAPACITY_DECAY_DAYS)
+    return {capacity_type: scaled * factor for capacity_type, scaled in scaled_ema.items()}
+
+
+# The capacity EMA runs over score * weight * exp(-(now - performed_at) / 60d).
+# exp(-(now - anchor) / 60d) is common to every term, so the EMA is kept over
+# score * weight * exp((performed_at - anchor) / 60d) and only scaled at read time.
+@dataclass(slots=True)
+class CapacityStatistics:
+    anchor: datetime
+    last_key: tuple[datetime, str] | None = None
+    scaled_ema: dict[CapacityType, float] = field(default_factory=dict)
+    performed_at: list[datetime] = field(default_factory=list)
+
+    def can_append(self, performed_at: datetime, attempt_id: str) -> bool:
+        return self.last_key is None or (performed_at, attempt_id) > self.last_key
+
+    def append(
+        self, performed_at: datetime, attempt_id: str, score_norm: float, weights: dict[CapacityType, float]
+    ) -> None:
+        growth = math.exp(_days_between(self.anchor, performed_at) / CAPACITY_DECAY_DAYS)
+        for capacity_type, weight in weights.items():
+            value = score_norm * weight * growth
+            previous = self.scaled_ema.get(capacity_type)
+            if previous is None:
+                self.scaled_ema[capacity_type] = value
+            else:
+                self.scaled_ema[capacity_type] = (CAPACITY_EMA_ALPHA * value) + ((1.0 - CAPACITY_EMA_ALPHA) * previous)
+        self.performed_at.append(performed_at)
+        self.last_key = (performed_at, attempt_id)
+
+    def value_at(self, capacity_type: CapacityType, now: datetime) -> float | None:
+        scaled = self.scaled_ema.get(capacity_type)
+        if scaled is None:
+            return None
+        return scaled * math.exp(-_days_between(self.anchor, now) / CAPACITY_DECAY_DAYS)
+
+    def values_at(self, now: datetime) -> dict[CapacityType, float]:
+        return decayed_values(self.anchor, self.scaled_ema, now)
+
+    def count_since(self, since: datetime) -> int:
+        return len(self.performed_at) - bisect_left(self.performed_at, since)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from threading import Lock
+
+from src.application.dtos.ranking import LeaderboardDTO
+
+
+@dataclass(slots=True, frozen=True)
+class CachedLeaderboardPage:
+    version: int
+    page: LeaderboardDTO
+
+
+class LeaderboardResponseCache:
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedLeaderboardPage] = OrderedDict()
+        self._inflight: dict[Hashable, Lock] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        version: int,
+        compute: Callable[[], tuple[int, LeaderboardDTO]],
+    ) -> LeaderboardDTO:
+        cached = self._get(key, version)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._inflight.setdefault(key, Lock())
+        with flight:
+            cached = self._get(key, version)
+            if cached is not None:
+                return cached
+            with self._lock:
+                self.misses += 1
+            computed_version, page = compute()
+            self._put(key, CachedLeaderboardPage(version=computed_version, page=page))
+        with self._lock:
+            if self._inflight.get(key) is flight and not flight.locked():
+                del self._inflight[key]
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: Hashable, version: int) -> LeaderboardDTO | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.page
+
+    def _put(self, key: Hashable, entry: CachedLeaderboardPage) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
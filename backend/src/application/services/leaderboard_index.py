@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.adapters.outbound.persistence.models.enums import (
+    LeaderboardPeriod,
+    LeaderboardScope,
+    ScaleCode,
+)
+
+LeaderboardKey = tuple[str, LeaderboardScope, str | None, LeaderboardPeriod, ScaleCode]
+SortKey = tuple[float, datetime, str]
+GroupKey = tuple[str, ScaleCode]
+
+_BLOCK_LOAD = 256
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardCandidate:
+    attempt_id: str
+    athlete_id: str
+    score_norm: float
+    performed_at: datetime
+
+    @property
+    def sort_key(self) -> SortKey:
+        return (-self.score_norm, self.performed_at, self.athlete_id)
+
+    @property
+    def preference_key(self) -> SortKey:
+        return (-self.score_norm, self.performed_at, self.attempt_id)
+
+
+class SortedKeys:
+    # Blocked sorted list: inserts and removals shift at most 2 * _BLOCK_LOAD keys, and a Fenwick tree over
+    # block sizes turns positions into ranks (and back) in O(log n).
+    def __init__(self) -> None:
+        self._blocks: list[list[SortKey]] = []
+        self._maxes: list[SortKey] = []
+        self._tree: list[int] = [0]
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: SortKey) -> None:
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._rebuild_tree()
+            return
+
+        index = bisect_left(self._maxes, key)
+        if index == len(self._blocks):
+            index -= 1
+            self._blocks[index].append(key)
+            self._maxes[index] = key
+        else:
+            insort(self._blocks[index], key)
+        self._len += 1
+
+        block = self._blocks[index]
+        if len(block) > 2 * _BLOCK_LOAD:
+            self._blocks[index : index + 1] = [block[:_BLOCK_LOAD], block[_BLOCK_LOAD:]]
+            self._maxes[index : index + 1] = [block[_BLOCK_LOAD - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(index, 1)
+
+    def discard(self, key: SortKey) -> None:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._blocks):
+            return
+        block = self._blocks[index]
+        position = bisect_left(block, key)
+        if block[position] != key:
+            return
+        del block[position]
+        self._len -= 1
+        if block:
+            self._maxes[index] = block[-1]
+            self._tree_add(index, -1)
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+            self._rebuild_tree()
+
+    def bisect_left(self, key: SortKey) -> int:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._blocks):
+            return self._len
+        return self._prefix(index) + bisect_left(self._blocks[index], key)
+
+    def bisect_right(self, key: SortKey) -> int:
+        index = bisect_right(self._maxes, key)
+        if index == len(self._blocks):
+            return self._len
+        return self._prefix(index) + bisect_right(self._blocks[index], key)
+
+    def slice(self, start: int, stop: int | None) -> list[SortKey]:
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return []
+        index, offset = self._locate(start)
+        keys: list[SortKey] = []
+        remaining = stop - start
+        while remaining > 0:
+            chunk = self._blocks[index][offset : offset + remaining]
+            keys.extend(chunk)
+            remaining -= len(chunk)
+            index += 1
+            offset = 0
+        return keys
+
+    def _rebuild_tree(self) -> None:
+        tree = [0, *(len(block) for block in self._blocks)]
+        for node in range(1, len(tree)):
+            parent = node + (node & -node)
+            if parent < len(tree):
+                tree[parent] += tree[node]
+        self._tree = tree
+
+    def _tree_add(self, index: int, delta: int) -> None:
+        node = index + 1
+        while node < len(self._tree):
+            self._tree[node] += delta
+            node += node & -node
+
+    def _prefix(self, index: int) -> int:
+        total = 0
+        node = index
+        while node > 0:
+            total += self._tree[node]
+            node -= node & -node
+        return total
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        index = 0
+        step = 1 << (len(self._tree).bit_length() - 1)
+        while step:
+            node = index + step
+            if node < len(self._tree) and self._tree[node] <= position:
+                index = node
+                position -= self._tree[node]
+            step >>= 1
+        return index, position
+
+
+class SortedLeaderboard:
+    def __init__(self) -> None:
+        self._keys = SortedKeys()
+        self._by_athlete: dict[str, LeaderboardCandidate] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, athlete_id: str) -> LeaderboardCandidate | None:
+        return self._by_athlete.get(athlete_id)
+
+    def upsert(self, candidate: LeaderboardCandidate) -> None:
+        current = self._by_athlete.get(candidate.athlete_id)
+        if current == candidate:
+            return
+        if current is not None:
+            self._keys.discard(current.sort_key)
+        self._by_athlete[candidate.athlete_id] = candidate
+        self._keys.add(candidate.sort_key)
+        self.version += 1
+
+    def remove(self, athlete_id: str) -> None:
+        current = self._by_athlete.pop(athlete_id, None)
+        if current is not None:
+            self._keys.discard(current.sort_key)
+            self.version += 1
+
+    def rank_of(self, athlete_id: str) -> int | None:
+        current = self._by_athlete.get(athlete_id)
+        if current is None:
+            return None
+        return self._keys.bisect_left(current.sort_key) + 1
+
+    def entries(self) -> list[LeaderboardCandidate]:
+        return self.page(0, None)
+
+    def page(self, offset: int, limit: int | None) -> list[LeaderboardCandidate]:
+        stop = None if limit is None else offset + limit
+        return [self._by_athlete[athlete_id] for _, _, athlete_id in self._keys.slice(offset, stop)]
+
+    def offset_after(self, key: SortKey) -> int:
+        return self._keys.bisect_right(key)
+
+
+class LeaderboardIndex:
+    def __init__(self, window: timedelta = timedelta(days=30)) -> None:
+        self._window = window
+        self._window_start: datetime | None = None
+        self._candidates: dict[LeaderboardPeriod, dict[GroupKey, dict[str, dict[str, LeaderboardCandidate]]]] = {
+            LeaderboardPeriod.ALL_TIME: {},
+            LeaderboardPeriod.D30: {},
+        }
+        self._window_days: dict[int, list[tuple[datetime, str, GroupKey, str]]] = {}
+        self._window_day_heap: list[int] = []
+        self._boards: dict[LeaderboardKey, SortedLeaderboard] = {}
+        self._athlete_gym: dict[str, str] = {}
+        self._groups_by_athlete: dict[str, set[GroupKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def board(self, key: LeaderboardKey) -> SortedLeaderboard | None:
+        return self._boards.get(key)
+
+    def supersede(self, previous: LeaderboardIndex) -> None:
+        # Versions keep growing across a rebuild, so pages cached from the previous boards never match.
+        for key, previous_board in previous._boards.items():
+            board = self._boards.get(key)
+            if board is None:
+                board = self._boards[key] = SortedLeaderboard()
+            board.version += previous_board.version + 1
+
+    def add(
+        self, workout_id: str, scale_code: ScaleCode, gym_id: str, candidate: LeaderboardCandidate, now: datetime
+    ) -> None:
+        group = (workout_id, scale_code)
+        self._groups_by_athlete.setdefault(candidate.athlete_id, set()).add(group)
+        self._athlete_gym[candidate.athlete_id] = gym_id
+        self._offer(group, LeaderboardPeriod.ALL_TIME, candidate)
+
+        self.advance(now)
+        if self._window_start is not None and candidate.performed_at >= self._window_start:
+            day = candidate.performed_at.date().toordinal()
+            bucket = self._window_days.get(day)
+            if bucket is None:
+                bucket = self._window_days[day] = []
+                heapq.heappush(self._window_day_heap, day)
+            insort(bucket, (candidate.performed_at, candidate.attempt_id, group, candidate.athlete_id))
+            self._offer(group, LeaderboardPeriod.D30, candidate)
+
+    def remove(self, workout_id: str, scale_code: ScaleCode, athlete_id: str, attempt_id: str) -> None:
+        group = (workout_id, scale_code)
+        if self._withdraw(group, LeaderboardPeriod.ALL_TIME, athlete_id, attempt_id):
+            self._withdraw(group, LeaderboardPeriod.D30, athlete_id, attempt_id)
+            if athlete_id not in self._candidates[LeaderboardPeriod.ALL_TIME].get(group, {}):
+                self._groups_by_athlete[athlete_id].discard(group)
+
+    def discard_group(self, workout_id: str, scale_code: ScaleCode) -> None:
+        athletes = self._candidates[LeaderboardPeriod.ALL_TIME].get((workout_id, scale_code), {})
+        for athlete_id, candidates in list(athletes.items()):
+            for attempt_id in list(candidates):
+                self.remove(workout_id, scale_code, athlete_id, attempt_id)
+
+    def advance(self, now: datetime) -> None:
+        window_start = now - self._window
+        if self._window_start is not None and window_start <= self._window_start:
+            return
+        self._window_start = window_start
+        first_day = window_start.date().toordinal()
+        while self._window_day_heap and self._window_day_heap[0] <= first_day:
+            day = self._window_day_heap[0]
+            bucket = self._window_days[day]
+            expired = len(bucket) if day < first_day else bisect_left(bucket, (window_start, ""))
+            for _, attempt_id, group, athlete_id in bucket[:expired]:
+                self._withdraw(group, LeaderboardPeriod.D30, athlete_id, attempt_id)
+            del bucket[:expired]
+            if bucket:
+                break
+            heapq.heappop(self._window_day_heap)
+            del self._window_days[day]
+
+    def move_athlete(self, athlete_id: str, gym_id: str) -> None:
+        previous_gym_id = self._athlete_gym.get(athlete_id)
+        if previous_gym_id is None or previous_gym_id == gym_id:
+            return
+        self._athlete_gym[athlete_id] = gym_id
+        for group in self._groups_by_athlete.get(athlete_id, ()):
+            for period in (LeaderboardPeriod.ALL_TIME, LeaderboardPeriod.D30):
+                previous_board = self._boards.get(self._key(group, LeaderboardScope.GYM, previous_gym_id, period))
+                if previous_board is not None:
+                    previous_board.remove(athlete_id)
+                self._refresh_athlete(group, period, athlete_id)
+
+    def _offer(self, group: GroupKey, period: LeaderboardPeriod, candidate: LeaderboardCandidate) -> None:
+        athletes = self._candidates[period].setdefault(group, {})
+        athletes.setdefault(candidate.athlete_id, {})[candidate.attempt_id] = candidate
+        community = self._board_for(group, LeaderboardScope.COMMUNITY, None, period)
+        current = community.get(candidate.athlete_id)
+        if current is None or candidate.preference_key < current.preference_key:
+            community.upsert(candidate)
+            self._board_for(group, LeaderboardScope.GYM, self._athlete_gym[candidate.athlete_id], period).upsert(candidate)
+
+    def _withdraw(self, group: GroupKey, period: LeaderboardPeriod, athlete_id: str, attempt_id: str) -> bool:
+        athletes = self._candidates[period].get(group, {})
+        athlete_candidates = athletes.get(athlete_id)
+        if athlete_candidates is None or athlete_candidates.pop(attempt_id, None) is None:
+            return False
+        if not athlete_candidates:
+            del athletes[athlete_id]
+        current = self._board_for(group, LeaderboardScope.COMMUNITY, None, period).get(athlete_id)
+        if current is not None and current.attempt_id == attempt_id:
+            self._refresh_athlete(group, period, athlete_id)
+        return True
+
+    def _refresh_athlete(self, group: GroupKey, period: LeaderboardPeriod, athlete_id: str) -> None:
+        candidates = self._candidates[period].get(group, {}).get(athlete_id, {})
+        community = self._board_for(group, LeaderboardScope.COMMUNITY, None, period)
+        gym_board = self._board_for(group, LeaderboardScope.GYM, self._athlete_gym[athlete_id], period)
+        if not candidates:
+            community.remove(athlete_id)
+            gym_board.remove(athlete_id)
+            return
+        best = min(candidates.values(), key=lambda item: item.preference_key)
+        community.upsert(best)
+        gym_board.upsert(best)
+
+    def _board_for(
+        self, group: GroupKey, scope: LeaderboardScope, gym_id: str | None, period: LeaderboardPeriod
+    ) -> SortedLeaderboard:
+        key = self._key(group, scope, gym_id, period)
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = SortedLeaderboard()
+        return board
+
+    @staticmethod
+    def _key(
+        group: GroupKey, scope: LeaderboardScope, gym_id: str | None, period: LeaderboardPeriod
+    ) -> LeaderboardKey:
+        workout_id, scale_code = group
+        return (workout_id, scope, gym_id, period, scale_code)
+
+
+def encode_cursor(candidate: LeaderboardCandidate) -> str:
+    score, performed_at, athlete_id = candidate.sort_key
+    payload = json.dumps([score, performed_at.isoformat(), athlete_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        score, performed_at, athlete_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = (float(score), datetime.fromisoformat(performed_at), str(athlete_id))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid leaderboard cursor") from exc
+    if key[1].tzinfo is None:
+        raise ValueError("Invalid leaderboard cursor")
+    return key
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.application.services.runtime_service import RefreshTokenRecord
+
+
+class RefreshTokenStore:
+    def __init__(self) -> None:
+        self._by_hash: dict[str, RefreshTokenRecord] = {}
+        self._eviction_heap: list[tuple[datetime, str]] = []
+        self._live_by_user: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def values(self) -> list[RefreshTokenRecord]:
+        return list(self._by_hash.values())
+
+    def add(self, record: RefreshTokenRecord) -> None:
+        self._by_hash[record.token_hash] = record
+        if record.revoked_at is None:
+            self._live_by_user.setdefault(record.user_id, set()).add(record.token_hash)
+        heapq.heappush(self._eviction_heap, (record.expires_at, record.token_hash))
+
+    def get(self, token_hash: str) -> RefreshTokenRecord | None:
+        return self._by_hash.get(token_hash)
+
+    def live_for_user(self, user_id: str, now: datetime) -> list[RefreshTokenRecord]:
+        live: list[RefreshTokenRecord] = []
+        for token_hash in self._live_by_user.get(user_id, ()):
+            record = self._by_hash.get(token_hash)
+            if record is not None and record.revoked_at is None and record.expires_at > now:
+                live.append(record)
+        return live
+
+    def revoke(self, record: RefreshTokenRecord, revoked_at: datetime) -> None:
+        # Revoked records stay until they expire so that reusing one is still recognised as such.
+        record.revoked_at = revoked_at
+        self._discard_live(record)
+
+    def prune(self, now: datetime) -> int:
+        evicted = 0
+        while self._eviction_heap and self._eviction_heap[0][0] <= now:
+            _, token_hash = heapq.heappop(self._eviction_heap)
+            record = self._by_hash.get(token_hash)
+            if record is None or record.expires_at > now:
+                continue
+            del self._by_hash[token_hash]
+            self._discard_live(record)
+            evicted += 1
+        return evicted
+
+    def _discard_live(self, record: RefreshTokenRecord) -> None:
+        user_tokens = self._live_by_user.get(record.user_id)
+        if user_tokens is None:
+            return
+        user_tokens.discard(record.token_hash)
+        if not user_tokens:
+            del self._live_by_user[record.user_id]
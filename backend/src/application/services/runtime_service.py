@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import copy
 import hashlib
-import math
 import secrets
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from threading import RLock
@@ -37,6 +38,9 @@ from src.adapters.outbound.persistence.models.enums import (
     WorkoutVisibility,
 )
 from src.application.dtos.admin import (
+    AdminCacheStatsDTO,
+    AdminCacheStatsResponseDTO,
+    AdminCapacityRefreshResponseDTO,
     AdminChangeGymRequestDTO,
     AdminChangeGymResponseDTO,
     AdminCreateMovementRequestDTO,
@@ -46,6 +50,7 @@ from src.application.dtos.athlete import (
     AthleteTrendDTO,
     AttemptDTO,
     CapacityDTO,
+    CapacityImpactBreakdownDTO,
     CreateAttemptRequestDTO,
     CreateAttemptResponseDTO,
     MetersPrimaryResultDTO,
@@ -64,6 +69,7 @@ from src.application.dtos.auth import (
     RefreshResponseDTO,
     RegisterFromInviteRequestDTO,
     RegisterFromInviteResponseDTO,
+    SessionDTO,
 )
 from src.application.dtos.coach import (
     CoachAthleteDetailDTO,
@@ -93,12 +99,25 @@ from src.application.dtos.public import (
     WorkoutScaleDTO,
 )
 from src.application.dtos.ranking import LeaderboardDTO, LeaderboardEntryDTO, RecomputeRankingsResponseDTO
+from src.application.services.access_token_cache import AccessTokenCache, CachedAccessToken
+from src.application.services.athlete_attempt_index import AthleteAttemptIndex
+from src.application.services.capacity_history import CapacityHistory
+from src.application.services.capacity_statistics import CapacityStatistics, decayed_values
+from src.application.services.leaderboard_cache import LeaderboardResponseCache
+from src.application.services.leaderboard_index import (
+    LeaderboardCandidate,
+    LeaderboardIndex,
+    SortedLeaderboard,
+    decode_cursor,
+    encode_cursor,
+)
 from src.application.services.movement_impact_transformer import (
     MovementImpactInput,
     compute_raw_movement_impact,
     normalize_capacity_impact,
     transform_movements_to_capacity_impact,
 )
+from src.application.services.refresh_token_store import RefreshTokenStore
 from src.infrastructure.config.settings import get_settings
 
 
@@ -222,6 +241,7 @@ class MovementRecord:
     requires_load: bool
     requires_bodyweight: bool
     created_at: datetime
+    version: int = 0
 
 
 @dataclass(slots=True)
@@ -285,6 +305,14 @@ class WorkoutDefinitionRecord:
     scales: list[WorkoutScaleRecord] = field(default_factory=list)
     blocks: list[WorkoutBlockRecord] = field(default_factory=list)
     capacity_weights: list[WorkoutCapacityWeightRecord] = field(default_factory=list)
+    version: int = 0
+
+
+@dataclass(slots=True)
+class WorkoutDerivedMetricsRecord:
+    stamp: tuple[int, tuple[int | None, ...]]
+    capacity_weights: dict[CapacityType, float]
+    impact_breakdown: CapacityImpactBreakdownDTO | None = None
 
 
 @dataclass(slots=True)
@@ -321,6 +349,7 @@ class WorkoutResultRecord:
     validated_by_user_id: str | None
     validated_at: datetime | None
     reject_reason: str | None
+    impact_breakdown: CapacityImpactBreakdownDTO | None = None
 
 
 @dataclass(slots=True)
@@ -352,26 +381,80 @@ class AthletePulseRecord:
     explain_json: list[dict[str, str]]
 
 
+@dataclass(slots=True, frozen=True)
+class RuntimeSnapshot:
+    state: dict[str, Any]
+    shared: dict[int, Any]
+
+
 @dataclass(slots=True)
-class LeaderboardEntryRecord:
-    leaderboard_id: str
-    athlete_id: str
-    best_attempt_id: str
-    best_score_norm: float
-    rank: int
-    updated_at: datetime
+class RankingRecomputeJobRecord:
+    id: str
+    status: str
+    workout_ids: list[str]
+    processed_workouts: int
+    recomputed: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+    dirty_workout_ids: set[str] = field(default_factory=set)
 
 
 @dataclass(slots=True)
-class LeaderboardRecord:
+class CapacityRefreshJobRecord:
     id: str
-    workout_definition_id: str
-    scope: LeaderboardScope
+    status: str
     gym_id: str | None
-    period: LeaderboardPeriod
-    scale_code: ScaleCode
-    updated_at: datetime
-    entries: list[LeaderboardEntryRecord] = field(default_factory=list)
+    gym_ids: list[str]
+    processed_gyms: int
+    refreshed_athletes: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+
+
+# Demo seed passwords are hashed once per process and reused by every reset().
+_SEED_PASSWORD_HASHES: dict[str, str] = {}
+
+# In-memory domain state built by reset() and captured by snapshot(); collaborators, caches and jobs stay out.
+_STATE_ATTRIBUTES = (
+    "users",
+    "_user_id_by_email",
+    "refresh_tokens",
+    "gyms",
+    "memberships",
+    "_active_membership_by_user",
+    "membership_history",
+    "invitations",
+    "_invitation_id_by_token",
+    "athlete_profiles",
+    "_athlete_profile_by_user_id",
+    "_athlete_ids_by_gym",
+    "coach_profiles",
+    "movements",
+    "workouts",
+    "assignments",
+    "_assignment_id_by_key",
+    "_assignment_ids_by_workout",
+    "_community_workout_ids",
+    "_gym_workout_ids",
+    "attempts",
+    "_attempts_by_athlete",
+    "_validated_attempt_ids_by_workout_scale",
+    "_attempt_count_by_workout",
+    "_leaderboard_index",
+    "_capacity_statistics",
+    "_workout_derived_metrics",
+    "results",
+    "_result_by_attempt_id",
+    "ideal_profiles",
+    "capacities",
+    "capacity_history",
+    "pulses",
+)
+
+# Entries returned on each side of the caller's own leaderboard position.
+_LEADERBOARD_NEIGHBOR_RADIUS = 2
 
 
 def _now() -> datetime:
@@ -388,6 +471,10 @@ def _clamp(value: float, lower: float, upper: float) -> float:
     return max(lower, min(upper, value))
 
 
+def _normalize_email(email: str) -> str:
+    return email.strip().casefold()
+
+
 def _hash_token(raw_token: str) -> str:
     return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
 
@@ -395,43 +482,92 @@ def _hash_token(raw_token: str) -> str:
 class RuntimeService:
     def __init__(self) -> None:
         self._lock = RLock()
-        self._hasher = PasswordHasher()
-        self._jwt = JwtService()
         self._settings = get_settings()
+        self._hasher = PasswordHasher(max_workers=self._settings.password_hasher_workers)
+        self._jwt = JwtService()
+        self.access_token_cache = AccessTokenCache(self._settings.access_token_cache_size)
+        self._recompute_jobs: dict[str, RankingRecomputeJobRecord] = {}
+        self._capacity_refresh_jobs: dict[str, CapacityRefreshJobRecord] = {}
+        self.leaderboard_cache = LeaderboardResponseCache(self._settings.leaderboard_cache_size)
         self.reset()
 
     def reset(self) -> None:
         with self._lock:
+            self.access_token_cache.clear()
+            self.leaderboard_cache.clear()
+            self._cancel_jobs()
             self.users: dict[str, UserRecord] = {}
-            self.refresh_tokens: dict[str, RefreshTokenRecord] = {}
+            self._user_id_by_email: dict[str, str] = {}
+            self.refresh_tokens = RefreshTokenStore()
             self.gyms: dict[str, GymRecord] = {}
             self.memberships: dict[str, GymMembershipRecord] = {}
+            self._active_membership_by_user: dict[str, GymMembershipRecord] = {}
             self.membership_history: dict[str, GymMembershipHistoryRecord] = {}
             self.invitations: dict[str, InvitationRecord] = {}
+            self._invitation_id_by_token: dict[str, str] = {}
             self.athlete_profiles: dict[str, AthleteProfileRecord] = {}
+            self._athlete_profile_by_user_id: dict[str, AthleteProfileRecord] = {}
+            self._athlete_ids_by_gym: dict[str, set[str]] = {}
             self.coach_profiles: dict[str, CoachProfileRecord] = {}
             self.movements: dict[str, MovementRecord] = {}
             self.workouts: dict[str, WorkoutDefinitionRecord] = {}
             self.assignments: dict[str, WorkoutAssignmentRecord] = {}
+            self._assignment_id_by_key: dict[tuple[str, AssignmentScope, str | None], str] = {}
+            self._assignment_ids_by_workout: dict[str, list[str]] = {}
+            self._community_workout_ids: set[str] = set()
+            self._gym_workout_ids: dict[str, set[str]] = {}
             self.attempts: dict[str, WorkoutAttemptRecord] = {}
+            self._attempts_by_athlete = AthleteAttemptIndex()
+            self._validated_attempt_ids_by_workout_scale: dict[tuple[str, ScaleCode], dict[str, None]] = {}
+            self._attempt_count_by_workout: dict[str, int] = {}
+            self._leaderboard_index = LeaderboardIndex()
+            self._capacity_statistics: dict[str, CapacityStatistics] = {}
+            self._workout_derived_metrics: dict[str, WorkoutDerivedMetricsRecord] = {}
             self.results: dict[str, WorkoutResultRecord] = {}
+            self._result_by_attempt_id: dict[str, WorkoutResultRecord] = {}
             self.ideal_profiles: dict[str, WorkoutIdealProfileRecord] = {}
             self.capacities: dict[tuple[str, CapacityType], AthleteCapacityRecord] = {}
-            self.capacity_history: list[tuple[str, CapacityType, datetime, float]] = []
+            self.capacity_history = CapacityHistory()
             self.pulses: dict[str, AthletePulseRecord] = {}
-            self.leaderboards: dict[
-                tuple[str, LeaderboardScope, str | None, LeaderboardPeriod, ScaleCode], LeaderboardRecord
-            ] = {}
             self._seed_defaults()
 
+    def snapshot(self) -> RuntimeSnapshot:
+        with self._lock:
+            state = {name: getattr(self, name) for name in _STATE_ATTRIBUTES}
+            shared = self._shared_immutable_objects()
+            return RuntimeSnapshot(state=copy.deepcopy(state, dict(shared)), shared=shared)
+
+    def restore(self, snapshot: RuntimeSnapshot) -> None:
+        with self._lock:
+            vars(self).update(copy.deepcopy(snapshot.state, dict(snapshot.shared)))
+            self.access_token_cache.clear()
+            self.leaderboard_cache.clear()
+            self._cancel_jobs()
+
+    def _shared_immutable_objects(self) -> dict[int, Any]:
+        # Movements are never mutated and workout structure lists are always replaced wholesale by
+        # _set_workout_structure, so snapshots and restored state can share them instead of copying.
+        # Derived workout metrics are likewise replaced, never edited, when the version stamp moves.
+        shared: list[Any] = list(self.movements.values())
+        for workout in self.workouts.values():
+            shared.extend((workout.scales, workout.blocks, workout.capacity_weights))
+        for derived in self._workout_derived_metrics.values():
+            shared.extend((derived, derived.capacity_weights))
+            if derived.impact_breakdown is not None:
+                shared.append(derived.impact_breakdown)
+        return {id(item): item for item in shared}
+
     def _seed_defaults(self) -> None:
         now = _now()
         gym = GymRecord(id=str(uuid4()), name="HybridForce HQ", created_at=now)
         self.gyms[gym.id] = gym
 
-        admin = self._create_user("admin@local.com", "Admin123!", UserRole.ADMIN)
-        coach = self._create_user("coach@local.com", "Coach123!", UserRole.COACH)
-        athlete = self._create_user("athlete@local.com", "Athlete123!", UserRole.ATHLETE)
+        seed_hashes = self._seed_password_hashes(("Admin123!", "Coach123!", "Athlete123!"))
+        admin = self._create_user("admin@local.com", "Admin123!", UserRole.ADMIN, password_hash=seed_hashes[0])
+        coach = self._create_user("coach@local.com", "Coach123!", UserRole.COACH, password_hash=seed_hashes[1])
+        athlete = self._create_user(
+            "athlete@local.com", "Athlete123!", UserRole.ATHLETE, password_hash=seed_hashes[2]
+        )
 
         self._upsert_membership(coach.id, gym.id, GymRole.COACH)
         self._upsert_membership(athlete.id, gym.id, GymRole.ATHLETE)
@@ -456,7 +592,7 @@ class RuntimeService:
             level_band=LevelBand.BEGINNER,
             created_at=now,
         )
-        self.athlete_profiles[athlete_profile.id] = athlete_profile
+        self._add_athlete_profile(athlete_profile)
 
         initial_movements = [
             ("Air Squat", MovementPattern.SQUAT, MovementUnit.REPS, False, True),
@@ -487,23 +623,36 @@ class RuntimeService:
         self._ensure_pulse_default(athlete_profile.id)
         _ = admin
 
-    def _create_user(self, email: str, password: str, role: UserRole) -> UserRecord:
+    def _seed_password_hashes(self, passwords: tuple[str, ...]) -> list[str]:
+        missing = [password for password in passwords if password not in _SEED_PASSWORD_HASHES]
+        if missing:
+            _SEED_PASSWORD_HASHES.update(zip(missing, self._hasher.hash_many(missing), strict=True))
+        return [_SEED_PASSWORD_HASHES[password] for password in passwords]
+
+    def _create_user(
+        self, email: str, password: str, role: UserRole, *, password_hash: str | None = None
+    ) -> UserRecord:
+        email = _normalize_email(email)
+        if email in self._user_id_by_email:
+            raise ConflictError("Email already registered")
+
         user = UserRecord(
             id=str(uuid4()),
-            email=email.lower(),
-            password_hash=self._hasher.hash(password),
+            email=email,
+            password_hash=password_hash or self._hasher.hash(password),
             role=role,
             status=UserStatus.ACTIVE,
             created_at=_now(),
             last_login_at=None,
         )
         self.users[user.id] = user
+        self._user_id_by_email[email] = user.id
         return user
 
     def _upsert_membership(self, user_id: str, gym_id: str, role_in_gym: GymRole) -> GymMembershipRecord:
-        for membership in self.memberships.values():
-            if membership.user_id == user_id and membership.active:
-                membership.active = False
+        previous = self._active_membership_by_user.get(user_id)
+        if previous is not None:
+            previous.active = False
 
         membership = GymMembershipRecord(
             id=str(uuid4()),
@@ -514,29 +663,46 @@ class RuntimeService:
             joined_at=_now(),
         )
         self.memberships[membership.id] = membership
+        self._active_membership_by_user[user_id] = membership
         return membership
 
     def decode_access_token(self, token: str) -> UserRecord:
-        try:
-            payload = self._jwt.decode(token)
-        except ValueError as exc:
-            raise UnauthorizedError("Invalid token") from exc
-
-        user_id = payload.get("sub")
-        if not isinstance(user_id, str):
-            raise UnauthorizedError("Invalid token payload")
+        cached = self.access_token_cache.get(token, time.time())
+        if cached is None:
+            try:
+                payload = self._jwt.decode(token)
+            except ValueError as exc:
+                raise UnauthorizedError("Invalid token") from exc
+
+            user_id = payload.get("sub")
+            if not isinstance(user_id, str):
+                raise UnauthorizedError("Invalid token payload")
+
+            expires_at = payload.get("exp")
+            if isinstance(expires_at, (int, float)):
+                self.access_token_cache.put(
+                    token,
+                    CachedAccessToken(user_id=user_id, expires_at=float(expires_at), claims=payload),
+                )
+        else:
+            user_id = cached.user_id
 
         user = self.users.get(user_id)
         if user is None or user.status != UserStatus.ACTIVE:
+            self.access_token_cache.invalidate_user(user_id)
             raise UnauthorizedError("User not found")
 
         return user
 
-    def login(self, email: str, password: str) -> LoginResponseDTO:
+    async def login(self, email: str, password: str) -> LoginResponseDTO:
         with self._lock:
             user = self._get_user_by_email(email)
-            if user is None or not self._hasher.verify(password, user.password_hash):
-                raise UnauthorizedError("Invalid credentials")
+            password_hash = user.password_hash if user is not None else None
+
+        if password_hash is None or not await self._hasher.verify_async(password, password_hash):
+            raise UnauthorizedError("Invalid credentials")
+
+        with self._lock:
             if user.status != UserStatus.ACTIVE:
                 raise UnauthorizedError("User is disabled")
 
@@ -557,7 +723,7 @@ class RuntimeService:
             if user is None or user.status != UserStatus.ACTIVE:
                 raise UnauthorizedError("User not available")
 
-            token_record.revoked_at = _now()
+            self.refresh_tokens.revoke(token_record, _now())
             new_refresh_token = self._issue_refresh_token(user.id)
             new_access_token = self._issue_access_token(user)
             return RefreshResponseDTO(accessToken=new_access_token, refreshToken=new_refresh_token)
@@ -565,9 +731,9 @@ class RuntimeService:
     def logout(self, refresh_token: str | None, user: UserRecord) -> None:
         with self._lock:
             if refresh_token is None:
-                for token_record in self.refresh_tokens.values():
-                    if token_record.user_id == user.id and token_record.revoked_at is None:
-                        token_record.revoked_at = _now()
+                now = _now()
+                for token_record in self.refresh_tokens.live_for_user(user.id, now):
+                    self.refresh_tokens.revoke(token_record, now)
                 return
 
             token_record = self._find_refresh_token(refresh_token)
@@ -577,7 +743,20 @@ class RuntimeService:
             if token_record.user_id != user.id:
                 raise ForbiddenError("Refresh token does not belong to user")
 
-            token_record.revoked_at = _now()
+            self.refresh_tokens.revoke(token_record, _now())
+
+    def list_sessions(self, user: UserRecord) -> list[SessionDTO]:
+        with self._lock:
+            sessions = self.refresh_tokens.live_for_user(user.id, _now())
+            sessions.sort(key=lambda item: item.created_at, reverse=True)
+            return [
+                SessionDTO(
+                    id=record.id,
+                    createdAt=_iso(record.created_at) or "",
+                    expiresAt=_iso(record.expires_at) or "",
+                )
+                for record in sessions
+            ]
 
     def create_invitation(self, current_user: UserRecord, payload: InviteCreateRequestDTO) -> InviteCreateResponseDTO:
         with self._lock:
@@ -592,7 +771,7 @@ class RuntimeService:
 
             invitation = InvitationRecord(
                 id=str(uuid4()),
-                email=payload.email.lower(),
+                email=_normalize_email(payload.email),
                 gym_id=payload.gym_id,
                 invited_by_user_id=current_user.id,
                 role=InvitationRole.ATHLETE,
@@ -602,6 +781,7 @@ class RuntimeService:
                 created_at=_now(),
             )
             self.invitations[invitation.id] = invitation
+            self._invitation_id_by_token[invitation.token] = invitation.id
             return InviteCreateResponseDTO(
                 invitationId=invitation.id,
                 token=invitation.token,
@@ -636,7 +816,7 @@ class RuntimeService:
                 level_band=LevelBand.BEGINNER,
                 created_at=_now(),
             )
-            self.athlete_profiles[athlete_profile.id] = athlete_profile
+            self._add_athlete_profile(athlete_profile)
             self._ensure_capacity_defaults(athlete_profile.id)
             self._ensure_pulse_default(athlete_profile.id)
 
@@ -669,10 +849,8 @@ class RuntimeService:
         if workout is None:
             raise NotFoundError("Workout not found")
 
-        if current_user.role == UserRole.ATHLETE:
-            visible_ids = {item.id for item in self._workouts_for_user(current_user)}
-            if workout_id not in visible_ids:
-                raise ForbiddenError("Workout not assigned to athlete")
+        if current_user.role == UserRole.ATHLETE and not self._is_workout_visible(current_user, workout_id):
+            raise ForbiddenError("Workout not assigned to athlete")
 
         return self._workout_detail_to_dto(workout)
 
@@ -689,8 +867,7 @@ class RuntimeService:
             if athlete_profile is None:
                 raise ForbiddenError("Athlete profile missing")
 
-            visible_ids = {item.id for item in self._workouts_for_user(current_user)}
-            if workout_id not in visible_ids:
+            if not self._is_workout_visible(current_user, workout_id):
                 raise ForbiddenError("Workout not assigned to athlete")
 
             if payload.scale_code not in {scale.code for scale in workout.scales}:
@@ -706,7 +883,7 @@ class RuntimeService:
                 scale_code=payload.scale_code,
                 status=AttemptStatus.DRAFT,
             )
-            self.attempts[attempt.id] = attempt
+            self._add_attempt(attempt)
             return CreateAttemptResponseDTO(attemptId=attempt.id, status=attempt.status)
 
     def submit_attempt_result(
@@ -735,33 +912,32 @@ class RuntimeService:
 
             existing_result = self._result_by_attempt(attempt.id)
             if existing_result is None:
-                impact_breakdown = self._build_impact_breakdown(workout)
                 result = WorkoutResultRecord(
                     id=str(uuid4()),
                     attempt_id=attempt.id,
                     primary_result_json=payload.primary_result.model_dump(mode="json", by_alias=True),
                     inputs_json=payload.inputs,
-                    derived_metrics_json={"impactBreakdown": impact_breakdown},
+                    derived_metrics_json={},
                     score_base=score_base,
                     score_norm=score_norm,
                     data_quality=DataQuality.OK,
                     validated_by_user_id=None,
                     validated_at=None,
                     reject_reason=None,
+                    impact_breakdown=self._impact_breakdown(workout),
                 )
-                self.results[result.id] = result
+                self._add_result(result)
             else:
-                impact_breakdown = self._build_impact_breakdown(workout)
                 existing_result.primary_result_json = payload.primary_result.model_dump(mode="json", by_alias=True)
                 existing_result.inputs_json = payload.inputs
-                existing_result.derived_metrics_json = {"impactBreakdown": impact_breakdown}
+                existing_result.impact_breakdown = self._impact_breakdown(workout)
                 existing_result.score_base = score_base
                 existing_result.score_norm = score_norm
                 existing_result.reject_reason = None
                 existing_result.validated_by_user_id = None
                 existing_result.validated_at = None
 
-            attempt.status = AttemptStatus.SUBMITTED
+            self._set_attempt_status(attempt, AttemptStatus.SUBMITTED)
             return self._attempt_to_dto(attempt)
 
     def get_athlete_dashboard(self, current_user: UserRecord) -> AthleteDashboardDTO:
@@ -770,18 +946,19 @@ class RuntimeService:
         if athlete_profile is None:
             raise NotFoundError("Athlete profile not found")
 
-        capacities = self._capacity_dtos(athlete_profile.id)
-        pulse = self._pulse_to_dto(athlete_profile.id)
-        tests7d, tests30d = self._attempt_counts(athlete_profile.id)
-        trends = self._capacity_trends_30d(athlete_profile.id)
+        with self._lock:
+            now = _now()
+            capacities, pulse = self._capacities_and_pulse_at(athlete_profile.id, now)
+            tests7d, tests30d = self._attempt_counts(athlete_profile.id)
+            trends = self._capacity_trends_30d(athlete_profile.id, capacities, now)
 
         return AthleteDashboardDTO(
             athleteId=athlete_profile.id,
             gymId=athlete_profile.current_gym_id,
             level=athlete_profile.level,
             levelBand=athlete_profile.level_band,
-            pulse=pulse,
-            capacities=capacities,
+            pulse=self._pulse_to_dto(pulse),
+            capacities=self._capacity_dtos(capacities),
             counts={"tests7d": tests7d, "tests30d": tests30d},
             trends30d=trends,
         )
@@ -795,25 +972,20 @@ class RuntimeService:
             coach_gym_id = self._coach_gym_id(current_user.id)
             if coach_gym_id is None:
                 raise ForbiddenError("Coach gym not found")
-            athletes = [profile for profile in self.athlete_profiles.values() if profile.current_gym_id == coach_gym_id]
+            athletes = self._athletes_in_gym(coach_gym_id)
 
         athlete_ids = {profile.id for profile in athletes}
         pending_submissions = sum(
-            1
-            for attempt in self.attempts.values()
-            if attempt.athlete_id in athlete_ids and attempt.status == AttemptStatus.SUBMITTED
+            self._attempts_by_athlete.count(athlete_id, AttemptStatus.SUBMITTED) for athlete_id in athlete_ids
         )
 
         today = _now().date()
         validated_today = 0
-        for result in self.results.values():
-            if result.validated_at is None:
-                continue
-            attempt = self.attempts.get(result.attempt_id)
-            if attempt is None or attempt.athlete_id not in athlete_ids:
-                continue
-            if result.validated_at.date() == today:
-                validated_today += 1
+        for athlete_id in athlete_ids:
+            for attempt_id in self._attempts_by_athlete.attempt_ids(athlete_id, AttemptStatus.VALIDATED):
+                result = self._result_by_attempt(attempt_id)
+                if result is not None and result.validated_at is not None and result.validated_at.date() == today:
+                    validated_today += 1
 
         return CoachOverviewDTO(
             gymId=coach_gym_id,
@@ -828,10 +1000,9 @@ class RuntimeService:
         if current_user.role == UserRole.COACH and coach_gym_id is None:
             raise ForbiddenError("Coach gym not found")
 
+        athletes = self._athletes_in_gym(coach_gym_id) if coach_gym_id is not None else self.athlete_profiles.values()
         result: list[CoachAthleteSummaryDTO] = []
-        for athlete in self.athlete_profiles.values():
-            if coach_gym_id is not None and athlete.current_gym_id != coach_gym_id:
-                continue
+        for athlete in athletes:
             user = self.users.get(athlete.user_id)
             if user is None:
                 continue
@@ -899,12 +1070,12 @@ class RuntimeService:
             if result is None:
                 raise ValidationServiceError("Attempt has no result submitted")
 
-            attempt.status = AttemptStatus.VALIDATED
+            self._set_attempt_status(attempt, AttemptStatus.VALIDATED)
             result.validated_by_user_id = current_user.id
             result.validated_at = _now()
             result.reject_reason = None
             result.data_quality = DataQuality.OK
-            self._recalculate_capacities_and_pulse(athlete.id)
+            self._update_capacities_and_pulse(athlete.id, attempt, result)
 
             attempt_dto = self._attempt_to_dto(attempt)
             return ValidateAttemptResponseDTO(
@@ -930,10 +1101,13 @@ class RuntimeService:
             if result is None:
                 raise ValidationServiceError("Attempt has no result to reject")
 
-            attempt.status = AttemptStatus.REJECTED
+            was_validated = attempt.status == AttemptStatus.VALIDATED
+            self._set_attempt_status(attempt, AttemptStatus.REJECTED)
             result.reject_reason = reason
             result.validated_at = None
             result.validated_by_user_id = None
+            if was_validated:
+                self._recalculate_capacities_and_pulse(athlete.id)
             return self._attempt_to_dto(attempt)
 
     def create_workout(self, current_user: UserRecord, payload: WorkoutCreateRequestDTO) -> WorkoutMutationResponseDTO:
@@ -991,6 +1165,7 @@ class RuntimeService:
             workout.score_type = score_type
             workout.updated_at = _now()
             self._set_workout_structure(workout, payload.scales, payload.blocks, payload.capacity_weights)
+            self._invalidate_capacity_statistics(workout.id)
             return self._workout_mutation_to_dto(workout)
 
     def publish_workout(self, current_user: UserRecord, workout_id: str) -> PublishWorkoutResponseDTO:
@@ -1025,9 +1200,9 @@ class RuntimeService:
                     status=AssignmentStatus.ACTIVE,
                     published_at=now,
                 )
-                self.assignments[assignment.id] = assignment
+                self._add_assignment(assignment)
             else:
-                assignment.status = AssignmentStatus.ACTIVE
+                self._set_assignment_status(assignment, AssignmentStatus.ACTIVE)
                 assignment.published_at = now
 
             return PublishWorkoutResponseDTO(
@@ -1082,26 +1257,17 @@ class RuntimeService:
             if current_user.role != UserRole.ADMIN and workout.author_coach_user_id != current_user.id:
                 raise ForbiddenError("Coach can only delete own workouts")
 
-            has_attempts = any(attempt.workout_definition_id == workout_id for attempt in self.attempts.values())
-            if has_attempts:
+            if self._attempt_count_by_workout.get(workout_id, 0):
                 raise ConflictError("No se puede eliminar porque tiene resultados asociados.")
 
-            self.assignments = {
-                assignment_id: assignment
-                for assignment_id, assignment in self.assignments.items()
-                if assignment.workout_definition_id != workout_id
-            }
+            self._remove_workout_assignments(workout_id)
             self.ideal_profiles = {
                 profile_id: profile
                 for profile_id, profile in self.ideal_profiles.items()
                 if profile.workout_definition_id != workout_id
             }
-            self.leaderboards = {
-                key: leaderboard
-                for key, leaderboard in self.leaderboards.items()
-                if leaderboard.workout_definition_id != workout_id
-            }
             del self.workouts[workout_id]
+            self._workout_derived_metrics.pop(workout_id, None)
 
             return DeleteWorkoutResponseDTO()
 
@@ -1210,9 +1376,15 @@ class RuntimeService:
         period: LeaderboardPeriod,
         scale_code: ScaleCode,
         current_user: UserRecord | None,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
     ) -> LeaderboardDTO:
         if workout_id not in self.workouts:
             raise NotFoundError("Workout not found")
+        if cursor is not None and offset:
+            raise BadRequestError("Use either cursor or offset")
 
         gym_id: str | None = None
         if scope == LeaderboardScope.GYM:
@@ -1222,24 +1394,290 @@ class RuntimeService:
             if gym_id is None:
                 raise ForbiddenError("User has no gym context")
 
-        return self._compute_leaderboard(workout_id, scope, gym_id, period, scale_code, current_user)
+        key = (workout_id, scope, gym_id, period, scale_code)
+        with self._lock:
+            if period == LeaderboardPeriod.D30:
+                self._leaderboard_index.advance(_now())
+            board = self._leaderboard_index.board(key)
+            version = board.version if board is not None else 0
+
+        def compute_page() -> tuple[int, LeaderboardDTO]:
+            with self._lock:
+                current_board = self._leaderboard_index.board(key)
+                dto = self._leaderboard_to_dto(
+                    current_board, workout_id, scope, period, scale_code, None, limit=limit, offset=offset, cursor=cursor
+                )
+                current_version = current_board.version if current_board is not None else 0
+            return current_version, dto
+
+        # The cached page is shared between callers; only a shallow copy carries the caller's position.
+        page = self.leaderboard_cache.get_or_compute((key, limit, offset, cursor), version, compute_page)
+        with self._lock:
+            my_rank, neighbors = self._leaderboard_position(self._leaderboard_index.board(key), current_user)
+        return page.model_copy(update={"my_rank": my_rank, "neighbors": neighbors})
 
     def recompute_rankings(self, current_user: UserRecord) -> RecomputeRankingsResponseDTO:
+        job = self.start_rankings_recompute(current_user)
+        if job.job_id is not None:
+            self.run_rankings_recompute(job.job_id)
+        return self.get_rankings_recompute_job(current_user, job.job_id or "")
+
+    def start_rankings_recompute(self, current_user: UserRecord) -> RecomputeRankingsResponseDTO:
+        self._require_roles(current_user, {UserRole.ADMIN})
+        with self._lock:
+            active = next(
+                (job for job in self._recompute_jobs.values() if job.status in {"queued", "running"}),
+                None,
+            )
+            if active is not None:
+                return self._recompute_job_to_dto(active)
+
+            self._prune_finished_jobs(self._recompute_jobs)
+            job = RankingRecomputeJobRecord(
+                id=str(uuid4()),
+                status="queued",
+                workout_ids=list(self.workouts.keys()),
+                processed_workouts=0,
+                recomputed=0,
+                created_at=_now(),
+            )
+            self._recompute_jobs[job.id] = job
+            return self._recompute_job_to_dto(job)
+
+    def get_rankings_recompute_job(self, current_user: UserRecord, job_id: str) -> RecomputeRankingsResponseDTO:
+        self._require_roles(current_user, {UserRole.ADMIN})
+        with self._lock:
+            job = self._recompute_jobs.get(job_id)
+            if job is None:
+                raise NotFoundError("Recompute job not found")
+            return self._recompute_job_to_dto(job)
+
+    def run_rankings_recompute(self, job_id: str) -> None:
+        chunk_size = max(self._settings.rankings_recompute_chunk_size, 1)
+        with self._lock:
+            job = self._recompute_jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return
+            job.status = "running"
+            now = _now()
+
+        staged = LeaderboardIndex()
+        try:
+            for start in range(0, len(job.workout_ids), chunk_size):
+                chunk = job.workout_ids[start : start + chunk_size]
+                with self._lock:
+                    if job.status != "running":
+                        return
+                    for workout_id in chunk:
+                        self._stage_workout_leaderboards(staged, workout_id, now)
+                    job.processed_workouts += len(chunk)
+                    job.recomputed = len(staged)
+        except Exception as exc:
+            with self._lock:
+                job.status = "failed"
+                job.error = str(exc)
+                job.finished_at = _now()
+            raise
+
+        with self._lock:
+            if job.status != "running":
+                return
+            # Validations, rejections and gym moves that landed between chunks are replayed before the swap.
+            for workout_id in job.dirty_workout_ids:
+                for scale_code in ScaleCode:
+                    staged.discard_group(workout_id, scale_code)
+            for workout_id in job.dirty_workout_ids:
+                self._stage_workout_leaderboards(staged, workout_id, now)
+            staged.advance(_now())
+            job.recomputed = len(staged)
+            staged.supersede(self._leaderboard_index)
+            self._leaderboard_index = staged
+            job.status = "ok"
+            job.finished_at = _now()
+
+    def _stage_workout_leaderboards(self, staged: LeaderboardIndex, workout_id: str, now: datetime) -> None:
+        if workout_id not in self.workouts:
+            return
+        for scale_code in ScaleCode:
+            for attempt in self._validated_attempts(workout_id, scale_code):
+                result = self._result_by_attempt(attempt.id)
+                athlete = self.athlete_profiles.get(attempt.athlete_id)
+                if result is None or athlete is None:
+                    continue
+                staged.add(
+                    workout_id,
+                    scale_code,
+                    athlete.current_gym_id,
+                    LeaderboardCandidate(
+                        attempt_id=attempt.id,
+                        athlete_id=attempt.athlete_id,
+                        score_norm=result.score_norm,
+                        performed_at=attempt.performed_at,
+                    ),
+                    now,
+                )
+
+    def _prune_finished_jobs(self, jobs: dict[str, Any]) -> None:
+        cutoff = _now() - timedelta(minutes=self._settings.admin_job_retention_minutes)
+        for job_id in [job_id for job_id, job in jobs.items() if job.finished_at is not None and job.finished_at < cutoff]:
+            del jobs[job_id]
+
+    def _cancel_jobs(self) -> None:
+        # Running jobs stop at their next chunk instead of writing into the freshly reset state.
+        for jobs in (self._recompute_jobs, self._capacity_refresh_jobs):
+            for job in jobs.values():
+                if job.status in {"queued", "running"}:
+                    job.status = "cancelled"
+                    job.finished_at = _now()
+            jobs.clear()
+
+    def _mark_leaderboards_dirty(self, workout_ids: list[str]) -> None:
+        for job in self._recompute_jobs.values():
+            if job.status == "running":
+                job.dirty_workout_ids.update(workout_ids)
+
+    def _recompute_job_to_dto(self, job: RankingRecomputeJobRecord) -> RecomputeRankingsResponseDTO:
+        return RecomputeRankingsResponseDTO(
+            status=job.status,
+            recomputed=job.recomputed,
+            jobId=job.id,
+            processedWorkouts=job.processed_workouts,
+            totalWorkouts=len(job.workout_ids),
+            error=job.error,
+        )
+
+    def refresh_capacities(
+        self, current_user: UserRecord, gym_id: str | None = None
+    ) -> AdminCapacityRefreshResponseDTO:
+        job = self.start_capacity_refresh(current_user, gym_id)
+        self.run_capacity_refresh(job.job_id)
+        return self.get_capacity_refresh_job(current_user, job.job_id)
+
+    def start_capacity_refresh(
+        self, current_user: UserRecord, gym_id: str | None = None
+    ) -> AdminCapacityRefreshResponseDTO:
+        self._require_roles(current_user, {UserRole.ADMIN})
+        with self._lock:
+            if gym_id is not None and gym_id not in self.gyms:
+                raise NotFoundError("Gym not found")
+            # Jobs for different gyms touch disjoint athletes and may run side by side.
+            active = next(
+                (
+                    job
+                    for job in self._capacity_refresh_jobs.values()
+                    if job.status in {"queued", "running"} and (gym_id is None or job.gym_id in {None, gym_id})
+                ),
+                None,
+            )
+            if active is not None:
+                return self._capacity_refresh_job_to_dto(active)
+
+            self._prune_finished_jobs(self._capacity_refresh_jobs)
+            if gym_id is not None:
+                gym_ids = [gym_id]
+            else:
+                gym_ids = sorted(item for item, athlete_ids in self._athlete_ids_by_gym.items() if athlete_ids)
+            job = CapacityRefreshJobRecord(
+                id=str(uuid4()),
+                status="queued",
+                gym_id=gym_id,
+                gym_ids=gym_ids,
+                processed_gyms=0,
+                refreshed_athletes=0,
+                created_at=_now(),
+            )
+            self._capacity_refresh_jobs[job.id] = job
+            return self._capacity_refresh_job_to_dto(job)
+
+    def get_capacity_refresh_job(self, current_user: UserRecord, job_id: str) -> AdminCapacityRefreshResponseDTO:
         self._require_roles(current_user, {UserRole.ADMIN})
-        recomputed = 0
         with self._lock:
-            self.leaderboards.clear()
-            gym_ids = sorted({athlete.current_gym_id for athlete in self.athlete_profiles.values()})
-            for workout in self.workouts.values():
-                for scale in workout.scales:
-                    for period in (LeaderboardPeriod.ALL_TIME, LeaderboardPeriod.D30):
-                        self._persist_leaderboard(workout.id, LeaderboardScope.COMMUNITY, None, period, scale.code)
-                        recomputed += 1
-                        for gym_id in gym_ids:
-                            self._persist_leaderboard(workout.id, LeaderboardScope.GYM, gym_id, period, scale.code)
-                            recomputed += 1
-
-        return RecomputeRankingsResponseDTO(status="ok", recomputed=recomputed)
+            job = self._capacity_refresh_jobs.get(job_id)
+            if job is None:
+                raise NotFoundError("Capacity refresh job not found")
+            return self._capacity_refresh_job_to_dto(job)
+
+    def run_capacity_refresh(self, job_id: str) -> None:
+        with self._lock:
+            job = self._capacity_refresh_jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return
+            job.status = "running"
+
+        try:
+            for gym_id in job.gym_ids:
+                with self._lock:
+                    if job.status != "running":
+                        return
+                    # Each gym batch decays to its own clock; athletes written by a live result
+                    # after the job was queued are already current and are left alone.
+                    now = _now()
+                    inputs: list[tuple[str, datetime, dict[CapacityType, float], int]] = []
+                    for athlete_id in sorted(self._athlete_ids_by_gym.get(gym_id, ())):
+                        if self._capacities_updated_after(athlete_id, job.created_at):
+                            continue
+                        item = self._capacity_refresh_inputs(athlete_id, now)
+                        if item is not None:
+                            inputs.append((athlete_id, *item))
+
+                # The decay itself runs without the lock; only the copy above and the swap below hold it.
+                refreshed = [
+                    (athlete_id, decayed_values(anchor, scaled_ema, now), self._confidence_from_attempts(recent))
+                    for athlete_id, anchor, scaled_ema, recent in inputs
+                ]
+
+                with self._lock:
+                    if job.status != "running":
+                        return
+                    for athlete_id, decayed, confidence in refreshed:
+                        if self._capacities_updated_after(athlete_id, now):
+                            continue
+                        values = self._merge_capacity_values(athlete_id, decayed)
+                        self._store_capacities_and_pulse(athlete_id, values, confidence, now)
+                        job.refreshed_athletes += 1
+                    job.processed_gyms += 1
+        except Exception as exc:
+            with self._lock:
+                job.status = "failed"
+                job.error = str(exc)
+                job.finished_at = _now()
+            raise
+
+        with self._lock:
+            if job.status != "running":
+                return
+            job.status = "ok"
+            job.finished_at = _now()
+
+    def _capacities_updated_after(self, athlete_id: str, moment: datetime) -> bool:
+        records = [self.capacities.get((athlete_id, capacity_type)) for capacity_type in CapacityType]
+        return all(record is not None and record.last_updated_at > moment for record in records)
+
+    def _capacity_refresh_inputs(
+        self, athlete_id: str, now: datetime
+    ) -> tuple[datetime, dict[CapacityType, float], int] | None:
+        statistics = self._capacity_statistics_for(athlete_id)
+        if not statistics.performed_at:
+            return None
+        return statistics.anchor, dict(statistics.scaled_ema), statistics.count_since(now - timedelta(days=60))
+
+    def _capacity_refresh_job_to_dto(self, job: CapacityRefreshJobRecord) -> AdminCapacityRefreshResponseDTO:
+        return AdminCapacityRefreshResponseDTO(
+            status=job.status,
+            jobId=job.id,
+            gymId=job.gym_id,
+            processedGyms=job.processed_gyms,
+            totalGyms=len(job.gym_ids),
+            refreshedAthletes=job.refreshed_athletes,
+            error=job.error,
+        )
+
+    def get_cache_stats(self, current_user: UserRecord) -> AdminCacheStatsResponseDTO:
+        self._require_roles(current_user, {UserRole.ADMIN})
+        return AdminCacheStatsResponseDTO(
+            accessTokens=AdminCacheStatsDTO(**self.access_token_cache.stats()),
+            leaderboards=AdminCacheStatsDTO(**self.leaderboard_cache.stats()),
+        )
 
     def admin_create_movement(
         self, current_user: UserRecord, payload: AdminCreateMovementRequestDTO
@@ -1278,7 +1716,7 @@ class RuntimeService:
 
             previous_gym_id = athlete.current_gym_id
             if previous_gym_id != payload.gym_id:
-                athlete.current_gym_id = payload.gym_id
+                self._move_athlete_to_gym(athlete, payload.gym_id)
                 self._upsert_membership(athlete.user_id, payload.gym_id, GymRole.ATHLETE)
                 history = GymMembershipHistoryRecord(
                     id=str(uuid4()),
@@ -1297,8 +1735,8 @@ class RuntimeService:
             )
 
     def _get_user_by_email(self, email: str) -> UserRecord | None:
-        email_key = email.strip().lower()
-        return next((user for user in self.users.values() if user.email == email_key), None)
+        user_id = self._user_id_by_email.get(_normalize_email(email))
+        return self.users.get(user_id) if user_id is not None else None
 
     def _issue_access_token(self, user: UserRecord) -> str:
         return self._jwt.encode(
@@ -1307,34 +1745,61 @@ class RuntimeService:
         )
 
     def _issue_refresh_token(self, user_id: str) -> str:
+        now = _now()
+        self.refresh_tokens.prune(now)
         raw = secrets.token_urlsafe(48)
         record = RefreshTokenRecord(
             id=str(uuid4()),
             user_id=user_id,
             token_hash=_hash_token(raw),
-            expires_at=_now() + timedelta(days=self._settings.refresh_token_expires_days),
+            expires_at=now + timedelta(days=self._settings.refresh_token_expires_days),
             revoked_at=None,
-            created_at=_now(),
+            created_at=now,
         )
-        self.refresh_tokens[record.id] = record
+        self.refresh_tokens.add(record)
         return raw
 
     def _find_refresh_token(self, raw_token: str) -> RefreshTokenRecord | None:
-        token_hash = _hash_token(raw_token)
-        return next((token for token in self.refresh_tokens.values() if token.token_hash == token_hash), None)
+        return self.refresh_tokens.get(_hash_token(raw_token))
 
     def _require_roles(self, current_user: UserRecord, allowed: set[UserRole]) -> None:
         if current_user.role not in allowed:
             raise ForbiddenError("Insufficient permissions")
 
     def _coach_gym_id(self, coach_user_id: str) -> str | None:
-        for membership in self.memberships.values():
-            if membership.user_id == coach_user_id and membership.active and membership.role_in_gym == GymRole.COACH:
-                return membership.gym_id
-        return None
+        membership = self._active_membership_by_user.get(coach_user_id)
+        if membership is None or membership.role_in_gym != GymRole.COACH:
+            return None
+        return membership.gym_id
 
     def _athlete_profile_by_user(self, user_id: str) -> AthleteProfileRecord | None:
-        return next((profile for profile in self.athlete_profiles.values() if profile.user_id == user_id), None)
+        return self._athlete_profile_by_user_id.get(user_id)
+
+    def _add_athlete_profile(self, profile: AthleteProfileRecord) -> None:
+        if profile.user_id in self._athlete_profile_by_user_id:
+            raise ConflictError("Athlete profile already exists for user")
+        self.athlete_profiles[profile.id] = profile
+        self._athlete_profile_by_user_id[profile.user_id] = profile
+        self._athlete_ids_by_gym.setdefault(profile.current_gym_id, set()).add(profile.id)
+
+    def _move_athlete_to_gym(self, athlete: AthleteProfileRecord, gym_id: str) -> None:
+        previous_bucket = self._athlete_ids_by_gym.get(athlete.current_gym_id)
+        if previous_bucket is not None:
+            previous_bucket.discard(athlete.id)
+            if not previous_bucket:
+                del self._athlete_ids_by_gym[athlete.current_gym_id]
+        athlete.current_gym_id = gym_id
+        self._athlete_ids_by_gym.setdefault(gym_id, set()).add(athlete.id)
+        self._leaderboard_index.move_athlete(athlete.id, gym_id)
+        self._mark_leaderboards_dirty(
+            [
+                self.attempts[attempt_id].workout_definition_id
+                for attempt_id in self._attempts_by_athlete.attempt_ids(athlete.id, AttemptStatus.VALIDATED)
+            ]
+        )
+
+    def _athletes_in_gym(self, gym_id: str) -> list[AthleteProfileRecord]:
+        return [self.athlete_profiles[athlete_id] for athlete_id in self._athlete_ids_by_gym.get(gym_id, ())]
 
     def _workouts_for_user(self, current_user: UserRecord) -> list[WorkoutDefinitionRecord]:
         if current_user.role in {UserRole.COACH, UserRole.ADMIN}:
@@ -1344,20 +1809,57 @@ class RuntimeService:
         if athlete_profile is None:
             return []
 
-        visible_workout_ids: set[str] = set()
-        for assignment in self.assignments.values():
-            if assignment.status != AssignmentStatus.ACTIVE:
-                continue
-            if assignment.scope == AssignmentScope.COMMUNITY:
-                visible_workout_ids.add(assignment.workout_definition_id)
-            elif assignment.scope == AssignmentScope.GYM and assignment.gym_id == athlete_profile.current_gym_id:
-                visible_workout_ids.add(assignment.workout_definition_id)
+        visible_workout_ids = self._community_workout_ids | self._gym_workout_ids.get(athlete_profile.current_gym_id, set())
+        return [self.workouts[workout_id] for workout_id in visible_workout_ids]
 
-        return [workout for workout in self.workouts.values() if workout.id in visible_workout_ids]
+    def _is_workout_visible(self, current_user: UserRecord, workout_id: str) -> bool:
+        if current_user.role in {UserRole.COACH, UserRole.ADMIN}:
+            return workout_id in self.workouts
+        if workout_id in self._community_workout_ids:
+            return True
+        athlete_profile = self._athlete_profile_by_user(current_user.id)
+        if athlete_profile is None:
+            return False
+        return workout_id in self._gym_workout_ids.get(athlete_profile.current_gym_id, ())
+
+    def _add_assignment(self, assignment: WorkoutAssignmentRecord) -> None:
+        key = (assignment.workout_definition_id, assignment.scope, assignment.gym_id)
+        if key in self._assignment_id_by_key:
+            raise ConflictError("Assignment already exists for workout scope")
+        self.assignments[assignment.id] = assignment
+        self._assignment_id_by_key[key] = assignment.id
+        self._assignment_ids_by_workout.setdefault(assignment.workout_definition_id, []).append(assignment.id)
+        self._index_assignment_visibility(assignment)
+
+    def _set_assignment_status(self, assignment: WorkoutAssignmentRecord, status: AssignmentStatus) -> None:
+        assignment.status = status
+        self._index_assignment_visibility(assignment)
+
+    def _index_assignment_visibility(self, assignment: WorkoutAssignmentRecord) -> None:
+        if assignment.scope == AssignmentScope.COMMUNITY:
+            bucket = self._community_workout_ids
+        elif assignment.gym_id is not None:
+            bucket = self._gym_workout_ids.setdefault(assignment.gym_id, set())
+        else:
+            return
+        if assignment.status == AssignmentStatus.ACTIVE:
+            bucket.add(assignment.workout_definition_id)
+        else:
+            bucket.discard(assignment.workout_definition_id)
+
+    def _remove_workout_assignments(self, workout_id: str) -> None:
+        for assignment_id in self._assignment_ids_by_workout.pop(workout_id, []):
+            assignment = self.assignments.pop(assignment_id)
+            del self._assignment_id_by_key[(workout_id, assignment.scope, assignment.gym_id)]
+            if assignment.scope == AssignmentScope.COMMUNITY:
+                self._community_workout_ids.discard(workout_id)
+            elif assignment.gym_id is not None:
+                self._gym_workout_ids.get(assignment.gym_id, set()).discard(workout_id)
 
     def _pick_assignment_for_athlete(self, workout_id: str, gym_id: str) -> str | None:
-        for assignment in self.assignments.values():
-            if assignment.workout_definition_id != workout_id or assignment.status != AssignmentStatus.ACTIVE:
+        for assignment_id in self._assignment_ids_by_workout.get(workout_id, ()):
+            assignment = self.assignments[assignment_id]
+            if assignment.status != AssignmentStatus.ACTIVE:
                 continue
             if assignment.scope == AssignmentScope.GYM and assignment.gym_id == gym_id:
                 return assignment.id
@@ -1366,10 +1868,65 @@ class RuntimeService:
         return None
 
     def _result_by_attempt(self, attempt_id: str) -> WorkoutResultRecord | None:
-        return next((result for result in self.results.values() if result.attempt_id == attempt_id), None)
+        return self._result_by_attempt_id.get(attempt_id)
+
+    def _add_attempt(self, attempt: WorkoutAttemptRecord) -> None:
+        self.attempts[attempt.id] = attempt
+        self._attempts_by_athlete.add(attempt)
+        workout_id = attempt.workout_definition_id
+        self._attempt_count_by_workout[workout_id] = self._attempt_count_by_workout.get(workout_id, 0) + 1
+        if attempt.status == AttemptStatus.VALIDATED:
+            self._validated_attempt_ids_by_workout_scale.setdefault((workout_id, attempt.scale_code), {})[attempt.id] = None
+            self._index_leaderboard_attempt(attempt)
+            self._mark_leaderboards_dirty([workout_id])
+            self._capacity_statistics.pop(attempt.athlete_id, None)
+
+    def _set_attempt_status(self, attempt: WorkoutAttemptRecord, status: AttemptStatus) -> None:
+        previous_status = attempt.status
+        attempt.status = status
+        self._attempts_by_athlete.move(attempt, previous_status)
+        key = (attempt.workout_definition_id, attempt.scale_code)
+        if status == AttemptStatus.VALIDATED:
+            self._validated_attempt_ids_by_workout_scale.setdefault(key, {})[attempt.id] = None
+            self._index_leaderboard_attempt(attempt)
+            self._mark_leaderboards_dirty([attempt.workout_definition_id])
+        elif previous_status == AttemptStatus.VALIDATED:
+            self._validated_attempt_ids_by_workout_scale.get(key, {}).pop(attempt.id, None)
+            self._leaderboard_index.remove(attempt.workout_definition_id, attempt.scale_code, attempt.athlete_id, attempt.id)
+            self._mark_leaderboards_dirty([attempt.workout_definition_id])
+            self._capacity_statistics.pop(attempt.athlete_id, None)
+
+    def _index_leaderboard_attempt(self, attempt: WorkoutAttemptRecord) -> None:
+        result = self._result_by_attempt(attempt.id)
+        athlete = self.athlete_profiles.get(attempt.athlete_id)
+        if result is None or athlete is None:
+            return
+        self._leaderboard_index.add(
+            attempt.workout_definition_id,
+            attempt.scale_code,
+            athlete.current_gym_id,
+            LeaderboardCandidate(
+                attempt_id=attempt.id,
+                athlete_id=attempt.athlete_id,
+                score_norm=result.score_norm,
+                performed_at=attempt.performed_at,
+            ),
+            _now(),
+        )
+
+    def _validated_attempts(self, workout_id: str, scale_code: ScaleCode) -> list[WorkoutAttemptRecord]:
+        attempt_ids = self._validated_attempt_ids_by_workout_scale.get((workout_id, scale_code), {})
+        return [self.attempts[attempt_id] for attempt_id in attempt_ids]
+
+    def _add_result(self, result: WorkoutResultRecord) -> None:
+        if result.attempt_id in self._result_by_attempt_id:
+            raise ConflictError("Result already exists for attempt")
+        self.results[result.id] = result
+        self._result_by_attempt_id[result.attempt_id] = result
 
     def _get_valid_invitation(self, token: str) -> InvitationRecord | None:
-        return next((invitation for invitation in self.invitations.values() if invitation.token == token), None)
+        invitation_id = self._invitation_id_by_token.get(token)
+        return self.invitations.get(invitation_id) if invitation_id is not None else None
 
     def _assert_movement_ids_exist(self, payload: WorkoutCreateRequestDTO | WorkoutUpdateRequestDTO) -> None:
         available_ids = set(self.movements.keys())
@@ -1485,6 +2042,7 @@ class RuntimeService:
         blocks: list,
         capacity_weights: list,
     ) -> None:
+        workout.version += 1
         workout.scales = []
         for scale in scales:
             reference_loads = getattr(scale, "reference_loads", getattr(scale, "reference_loads_json", {}))
@@ -1607,42 +2165,60 @@ class RuntimeService:
 
         return _clamp(score_base, 0.0, 100.0)
 
+    def _update_capacities_and_pulse(
+        self, athlete_id: str, attempt: WorkoutAttemptRecord, result: WorkoutResultRecord
+    ) -> None:
+        statistics = self._capacity_statistics.get(athlete_id)
+        if statistics is None or not statistics.can_append(attempt.performed_at, attempt.id):
+            self._recalculate_capacities_and_pulse(athlete_id)
+            return
+
+        workout = self.workouts.get(attempt.workout_definition_id)
+        if workout is not None and workout.is_test:
+            statistics.append(attempt.performed_at, attempt.id, float(result.score_norm), self._capacity_weights(workout))
+        self._write_capacities_and_pulse(athlete_id, statistics, _now())
+
     def _recalculate_capacities_and_pulse(self, athlete_id: str) -> None:
-        now = _now()
-        validated_records: list[tuple[WorkoutAttemptRecord, WorkoutResultRecord, WorkoutDefinitionRecord]] = []
-        for attempt in self.attempts.values():
-            if attempt.athlete_id != athlete_id or attempt.status != AttemptStatus.VALIDATED:
-                continue
+        statistics = self._rebuild_capacity_statistics(athlete_id)
+        self._write_capacities_and_pulse(athlete_id, statistics, _now())
+
+    def _capacity_statistics_for(self, athlete_id: str) -> CapacityStatistics:
+        statistics = self._capacity_statistics.get(athlete_id)
+        if statistics is None:
+            statistics = self._rebuild_capacity_statistics(athlete_id)
+        return statistics
+
+    def _invalidate_capacity_statistics(self, workout_id: str) -> None:
+        # Only athletes with validated attempts on the edited workout folded its old weights in.
+        for scale_code in ScaleCode:
+            for attempt_id in self._validated_attempt_ids_by_workout_scale.get((workout_id, scale_code), {}):
+                self._capacity_statistics.pop(self.attempts[attempt_id].athlete_id, None)
+
+    def _rebuild_capacity_statistics(self, athlete_id: str) -> CapacityStatistics:
+        statistics: CapacityStatistics | None = None
+        for attempt_id in self._attempts_by_athlete.attempt_ids(athlete_id, AttemptStatus.VALIDATED):
+            attempt = self.attempts[attempt_id]
             result = self._result_by_attempt(attempt.id)
             workout = self.workouts.get(attempt.workout_definition_id)
             if result is None or workout is None or not workout.is_test:
                 continue
-            validated_records.append((attempt, result, workout))
+            if statistics is None:
+                statistics = CapacityStatistics(anchor=attempt.performed_at)
+            statistics.append(attempt.performed_at, attempt.id, float(result.score_norm), self._capacity_weights(workout))
 
-        validated_records.sort(key=lambda item: item[0].performed_at)
-        attempts_last_60d = sum(1 for attempt, _, _ in validated_records if attempt.performed_at >= now - timedelta(days=60))
-        confidence = self._confidence_from_attempts(attempts_last_60d)
+        if statistics is None:
+            statistics = CapacityStatistics(anchor=_now())
+        self._capacity_statistics[athlete_id] = statistics
+        return statistics
 
-        for capacity_type in CapacityType:
-            sequence: list[float] = []
-            for attempt, result, workout in validated_records:
-                weights = self._capacity_weights(workout)
-                weight = weights.get(capacity_type)
-                if weight is None:
-                    continue
-                days = max((now - attempt.performed_at).total_seconds() / 86400.0, 0.0)
-                decay = math.exp(-(days / 60.0))
-                sequence.append(float(result.score_norm) * weight * decay)
-
-            if sequence:
-                ema = sequence[0]
-                for value in sequence[1:]:
-                    ema = (0.3 * value) + (0.7 * ema)
-                capacity_value = _clamp(ema, 0.0, 100.0)
-            else:
-                current = self.capacities.get((athlete_id, capacity_type))
-                capacity_value = current.value_0_100 if current else 0.0
+    def _write_capacities_and_pulse(self, athlete_id: str, statistics: CapacityStatistics, now: datetime) -> None:
+        values, confidence = self._capacity_values_at(athlete_id, statistics, now)
+        self._store_capacities_and_pulse(athlete_id, values, confidence, now)
 
+    def _store_capacities_and_pulse(
+        self, athlete_id: str, values: dict[CapacityType, float], confidence: Confidence, now: datetime
+    ) -> None:
+        for capacity_type, capacity_value in values.items():
             record = AthleteCapacityRecord(
                 athlete_id=athlete_id,
                 capacity_type=capacity_type,
@@ -1651,31 +2227,89 @@ class RuntimeService:
                 last_updated_at=now,
             )
             self.capacities[(athlete_id, capacity_type)] = record
-            self.capacity_history.append((athlete_id, capacity_type, now, capacity_value))
+            self.capacity_history.append(athlete_id, capacity_type, now, capacity_value)
 
-        self._recompute_pulse(athlete_id, now)
+        self.pulses[athlete_id] = self._pulse_record(athlete_id, values, confidence, now)
 
-    def _capacity_weights(self, workout: WorkoutDefinitionRecord) -> dict[CapacityType, float]:
-        if workout.capacity_weights:
-            return {item.capacity_type: float(item.weight) for item in workout.capacity_weights}
+    def _capacity_values_at(
+        self, athlete_id: str, statistics: CapacityStatistics, now: datetime
+    ) -> tuple[dict[CapacityType, float], Confidence]:
+        confidence = self._confidence_from_attempts(statistics.count_since(now - timedelta(days=60)))
+        return self._merge_capacity_values(athlete_id, statistics.values_at(now)), confidence
 
-        movement_inputs: list[MovementImpactInput] = []
+    def _merge_capacity_values(self, athlete_id: str, decayed: dict[CapacityType, float]) -> dict[CapacityType, float]:
+        values: dict[CapacityType, float] = {}
+        for capacity_type in CapacityType:
+            value = decayed.get(capacity_type)
+            if value is not None:
+                values[capacity_type] = _clamp(value, 0.0, 100.0)
+            else:
+                current = self.capacities.get((athlete_id, capacity_type))
+                values[capacity_type] = current.value_0_100 if current else 0.0
+        return values
+
+    def _capacities_and_pulse_at(
+        self, athlete_id: str, now: datetime
+    ) -> tuple[list[AthleteCapacityRecord], AthletePulseRecord]:
+        self._ensure_capacity_defaults(athlete_id)
+        self._ensure_pulse_default(athlete_id)
+        stored = [self.capacities[(athlete_id, capacity_type)] for capacity_type in CapacityType]
+        statistics = self._capacity_statistics_for(athlete_id)
+        if not statistics.performed_at:
+            return stored, self.pulses[athlete_id]
+
+        # Decay is evaluated at read time from the factored statistics, so the dashboard does not wait
+        # for the next capacity refresh job; capacities, pulse and trends all share this evaluation.
+        values, confidence = self._capacity_values_at(athlete_id, statistics, now)
+        capacities = [
+            AthleteCapacityRecord(
+                athlete_id=athlete_id,
+                capacity_type=record.capacity_type,
+                value_0_100=values[record.capacity_type],
+                confidence=confidence,
+                last_updated_at=record.last_updated_at,
+            )
+            for record in stored
+        ]
+        return capacities, self._pulse_record(athlete_id, values, confidence, now)
+
+    def _workout_derived(self, workout: WorkoutDefinitionRecord) -> WorkoutDerivedMetricsRecord:
+        stamp = (workout.version, self._referenced_movement_versions(workout))
+        derived = self._workout_derived_metrics.get(workout.id)
+        if derived is None or derived.stamp != stamp:
+            derived = WorkoutDerivedMetricsRecord(stamp=stamp, capacity_weights=self._compute_capacity_weights(workout))
+            self._workout_derived_metrics[workout.id] = derived
+        return derived
+
+    def _referenced_movement_versions(self, workout: WorkoutDefinitionRecord) -> tuple[int | None, ...]:
+        versions: list[int | None] = []
         for block in workout.blocks:
             for movement in block.movements:
                 catalog_movement = self.movements.get(movement.movement_id)
-                if catalog_movement is None:
-                    continue
-                movement_inputs.append(
-                    MovementImpactInput(
-                        movement_id=movement.movement_id,
-                        pattern=catalog_movement.pattern,
-                        reps=movement.reps,
-                        meters=movement.meters,
-                        seconds=movement.seconds,
-                        calories=movement.calories,
-                    )
-                )
+                versions.append(catalog_movement.version if catalog_movement is not None else None)
+        return tuple(versions)
 
+    def _capacity_weights(self, workout: WorkoutDefinitionRecord) -> dict[CapacityType, float]:
+        return self._workout_derived(workout).capacity_weights
+
+    def _impact_breakdown(self, workout: WorkoutDefinitionRecord) -> CapacityImpactBreakdownDTO:
+        # Built once per workout version; every result of that version references the same frozen DTO.
+        # Snapshots share derived records, so the record is replaced rather than filled in.
+        derived = self._workout_derived(workout)
+        if derived.impact_breakdown is None:
+            derived = WorkoutDerivedMetricsRecord(
+                stamp=derived.stamp,
+                capacity_weights=derived.capacity_weights,
+                impact_breakdown=CapacityImpactBreakdownDTO.model_validate(self._build_impact_breakdown(workout)),
+            )
+            self._workout_derived_metrics[workout.id] = derived
+        return derived.impact_breakdown
+
+    def _compute_capacity_weights(self, workout: WorkoutDefinitionRecord) -> dict[CapacityType, float]:
+        if workout.capacity_weights:
+            return {item.capacity_type: float(item.weight) for item in workout.capacity_weights}
+
+        movement_inputs = self._movement_impact_inputs(workout)
         if movement_inputs:
             return transform_movements_to_capacity_impact(movement_inputs)
 
@@ -1697,6 +2331,25 @@ class RuntimeService:
             CapacityType.WORK_CAPACITY: 0.25,
         }
 
+    def _movement_impact_inputs(self, workout: WorkoutDefinitionRecord) -> list[MovementImpactInput]:
+        movement_inputs: list[MovementImpactInput] = []
+        for block in workout.blocks:
+            for movement in block.movements:
+                catalog_movement = self.movements.get(movement.movement_id)
+                if catalog_movement is None:
+                    continue
+                movement_inputs.append(
+                    MovementImpactInput(
+                        movement_id=movement.movement_id,
+                        pattern=catalog_movement.pattern,
+                        reps=movement.reps,
+                        meters=movement.meters,
+                        seconds=movement.seconds,
+                        calories=movement.calories,
+                    )
+                )
+        return movement_inputs
+
     def _build_impact_breakdown(self, workout: WorkoutDefinitionRecord) -> dict[str, Any]:
         movement_data: list[dict[str, Any]] = []
         block_aggregate: dict[str, dict[str, Any]] = {}
@@ -1786,15 +2439,15 @@ class RuntimeService:
             return Confidence.MED
         return Confidence.HIGH
 
-    def _recompute_pulse(self, athlete_id: str, computed_at: datetime) -> None:
-        capacities = [self.capacities[(athlete_id, capacity)] for capacity in CapacityType]
-        value = _clamp(sum(item.value_0_100 for item in capacities) / len(capacities), 0.0, 100.0)
-        confidence = min((item.confidence for item in capacities), key=self._confidence_order)
+    def _pulse_record(
+        self, athlete_id: str, values: dict[CapacityType, float], confidence: Confidence, computed_at: datetime
+    ) -> AthletePulseRecord:
+        value = _clamp(sum(values.values()) / len(values), 0.0, 100.0)
         explain = [
-            {"key": capacity.capacity_type.value, "message": f"value={capacity.value_0_100:.2f}; confidence={capacity.confidence.value}"}
-            for capacity in capacities
+            {"key": capacity_type.value, "message": f"value={capacity_value:.2f}; confidence={confidence.value}"}
+            for capacity_type, capacity_value in values.items()
         ]
-        self.pulses[athlete_id] = AthletePulseRecord(
+        return AthletePulseRecord(
             athlete_id=athlete_id,
             value_0_100=value,
             confidence=confidence,
@@ -1802,10 +2455,6 @@ class RuntimeService:
             explain_json=explain,
         )
 
-    def _confidence_order(self, confidence: Confidence) -> int:
-        order = {Confidence.LOW: 0, Confidence.MED: 1, Confidence.HIGH: 2}
-        return order[confidence]
-
     def _ensure_capacity_defaults(self, athlete_id: str) -> None:
         now = _now()
         for capacity in CapacityType:
@@ -1830,24 +2479,18 @@ class RuntimeService:
             explain_json=[],
         )
 
-    def _capacity_dtos(self, athlete_id: str) -> list[CapacityDTO]:
-        self._ensure_capacity_defaults(athlete_id)
-        result: list[CapacityDTO] = []
-        for capacity_type in CapacityType:
-            record = self.capacities[(athlete_id, capacity_type)]
-            result.append(
-                CapacityDTO(
-                    type=record.capacity_type,
-                    value=round(record.value_0_100, 2),
-                    confidence=record.confidence,
-                    lastUpdatedAt=_iso(record.last_updated_at) or "",
-                )
+    def _capacity_dtos(self, capacities: list[AthleteCapacityRecord]) -> list[CapacityDTO]:
+        return [
+            CapacityDTO(
+                type=record.capacity_type,
+                value=round(record.value_0_100, 2),
+                confidence=record.confidence,
+                lastUpdatedAt=_iso(record.last_updated_at) or "",
             )
-        return result
+            for record in capacities
+        ]
 
-    def _pulse_to_dto(self, athlete_id: str) -> PulseDTO:
-        self._ensure_pulse_default(athlete_id)
-        pulse = self.pulses[athlete_id]
+    def _pulse_to_dto(self, pulse: AthletePulseRecord) -> PulseDTO:
         return PulseDTO(
             value=round(pulse.value_0_100, 2),
             confidence=pulse.confidence,
@@ -1857,33 +2500,19 @@ class RuntimeService:
 
     def _attempt_counts(self, athlete_id: str) -> tuple[int, int]:
         now = _now()
-        tests7d = 0
-        tests30d = 0
-        for attempt in self.attempts.values():
-            if attempt.athlete_id != athlete_id or attempt.status != AttemptStatus.VALIDATED:
-                continue
-            if attempt.performed_at >= now - timedelta(days=7):
-                tests7d += 1
-            if attempt.performed_at >= now - timedelta(days=30):
-                tests30d += 1
+        tests7d = self._attempts_by_athlete.count_since(athlete_id, AttemptStatus.VALIDATED, now - timedelta(days=7))
+        tests30d = self._attempts_by_athlete.count_since(athlete_id, AttemptStatus.VALIDATED, now - timedelta(days=30))
         return tests7d, tests30d
 
-    def _capacity_trends_30d(self, athlete_id: str) -> list[AthleteTrendDTO]:
-        now = _now()
-        threshold = now - timedelta(days=30)
+    def _capacity_trends_30d(
+        self, athlete_id: str, capacities: list[AthleteCapacityRecord], now: datetime
+    ) -> list[AthleteTrendDTO]:
         trends: list[AthleteTrendDTO] = []
-        for capacity in CapacityType:
-            current = self.capacities.get((athlete_id, capacity))
-            if current is None:
-                trends.append(AthleteTrendDTO(type=capacity, delta=0.0))
-                continue
-
-            past_values = [
-                value
-                for aid, ctype, timestamp, value in self.capacity_history
-                if aid == athlete_id and ctype == capacity and timestamp <= threshold
-            ]
-            baseline = past_values[-1] if past_values else current.value_0_100
+        for current in capacities:
+            capacity = current.capacity_type
+            baseline = self.capacity_history.baseline(athlete_id, capacity, now)
+            if baseline is None:
+                baseline = current.value_0_100
             delta = round(current.value_0_100 - baseline, 2)
             trends.append(AthleteTrendDTO(type=capacity, delta=delta))
         return trends
@@ -1891,14 +2520,8 @@ class RuntimeService:
     def _find_assignment(
         self, workout_id: str, scope: AssignmentScope, gym_id: str | None
     ) -> WorkoutAssignmentRecord | None:
-        for assignment in self.assignments.values():
-            if (
-                assignment.workout_definition_id == workout_id
-                and assignment.scope == scope
-                and assignment.gym_id == gym_id
-            ):
-                return assignment
-        return None
+        assignment_id = self._assignment_id_by_key.get((workout_id, scope, gym_id))
+        return self.assignments.get(assignment_id) if assignment_id is not None else None
 
     def _upsert_ideal_profile(
         self,
@@ -1946,65 +2569,38 @@ class RuntimeService:
             return self._coach_gym_id(current_user.id)
         return None
 
-    def _compute_leaderboard(
+    def _leaderboard_to_dto(
         self,
+        board: SortedLeaderboard | None,
         workout_id: str,
         scope: LeaderboardScope,
-        gym_id: str | None,
         period: LeaderboardPeriod,
         scale_code: ScaleCode,
         current_user: UserRecord | None,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
     ) -> LeaderboardDTO:
-        now = _now()
-        threshold = now - timedelta(days=30)
-        athlete_by_attempt: dict[str, tuple[WorkoutAttemptRecord, WorkoutResultRecord]] = {}
-
-        for attempt in self.attempts.values():
-            if attempt.workout_definition_id != workout_id:
-                continue
-            if attempt.status != AttemptStatus.VALIDATED:
-                continue
-            if attempt.scale_code != scale_code:
-                continue
-            if period == LeaderboardPeriod.D30 and attempt.performed_at < threshold:
-                continue
-
-            athlete = self.athlete_profiles.get(attempt.athlete_id)
-            if athlete is None:
-                continue
-            if scope == LeaderboardScope.GYM and athlete.current_gym_id != gym_id:
-                continue
-
-            result = self._result_by_attempt(attempt.id)
-            if result is None:
-                continue
-
-            current_best = athlete_by_attempt.get(athlete.id)
-            if current_best is None or result.score_norm > current_best[1].score_norm:
-                athlete_by_attempt[athlete.id] = (attempt, result)
-
-        ranked = sorted(
-            athlete_by_attempt.items(),
-            key=lambda item: item[1][1].score_norm,
-            reverse=True,
-        )
-
         entries: list[LeaderboardEntryDTO] = []
+        neighbors: list[LeaderboardEntryDTO] = []
         my_rank: int | None = None
-        for idx, (athlete_id, (_attempt, result)) in enumerate(ranked, start=1):
-            athlete_profile = self.athlete_profiles.get(athlete_id)
-            user = self.users.get(athlete_profile.user_id) if athlete_profile else None
-            display_name = user.email.split("@", 1)[0] if user else athlete_id
-            entries.append(
-                LeaderboardEntryDTO(
-                    rank=idx,
-                    athleteId=athlete_id,
-                    displayName=display_name,
-                    bestScoreNorm=round(result.score_norm, 2),
-                )
-            )
-            if current_user and current_user.role == UserRole.ATHLETE and athlete_profile and athlete_profile.user_id == current_user.id:
-                my_rank = idx
+        next_cursor: str | None = None
+        total = 0
+        if cursor is not None:
+            try:
+                cursor_key = decode_cursor(cursor)
+            except ValueError as exc:
+                raise BadRequestError("Invalid ranking cursor") from exc
+            offset = board.offset_after(cursor_key) if board is not None else 0
+
+        if board is not None:
+            total = len(board)
+            page = board.page(offset, limit)
+            entries = [self._leaderboard_entry_to_dto(offset + idx, candidate) for idx, candidate in enumerate(page, start=1)]
+            if page and offset + len(page) < total:
+                next_cursor = encode_cursor(page[-1])
+            my_rank, neighbors = self._leaderboard_position(board, current_user)
 
         return LeaderboardDTO(
             scope=scope,
@@ -2013,51 +2609,37 @@ class RuntimeService:
             scaleCode=scale_code,
             entries=entries,
             myRank=my_rank,
+            total=total,
+            nextCursor=next_cursor,
+            neighbors=neighbors,
         )
 
-    def _persist_leaderboard(
-        self,
-        workout_id: str,
-        scope: LeaderboardScope,
-        gym_id: str | None,
-        period: LeaderboardPeriod,
-        scale_code: ScaleCode,
-    ) -> None:
-        dto = self._compute_leaderboard(workout_id, scope, gym_id, period, scale_code, None)
-        key = (workout_id, scope, gym_id, period, scale_code)
-        leaderboard = LeaderboardRecord(
-            id=str(uuid4()),
-            workout_definition_id=workout_id,
-            scope=scope,
-            gym_id=gym_id,
-            period=period,
-            scale_code=scale_code,
-            updated_at=_now(),
-            entries=[],
+    def _leaderboard_position(
+        self, board: SortedLeaderboard | None, current_user: UserRecord | None
+    ) -> tuple[int | None, list[LeaderboardEntryDTO]]:
+        if board is None or current_user is None or current_user.role != UserRole.ATHLETE:
+            return None, []
+        athlete_profile = self._athlete_profile_by_user(current_user.id)
+        my_rank = board.rank_of(athlete_profile.id) if athlete_profile is not None else None
+        if my_rank is None:
+            return None, []
+        start = max(my_rank - 1 - _LEADERBOARD_NEIGHBOR_RADIUS, 0)
+        neighbors = [
+            self._leaderboard_entry_to_dto(start + idx, candidate)
+            for idx, candidate in enumerate(board.page(start, 2 * _LEADERBOARD_NEIGHBOR_RADIUS + 1), start=1)
+        ]
+        return my_rank, neighbors
+
+    def _leaderboard_entry_to_dto(self, rank: int, candidate: LeaderboardCandidate) -> LeaderboardEntryDTO:
+        athlete_profile = self.athlete_profiles.get(candidate.athlete_id)
+        user = self.users.get(athlete_profile.user_id) if athlete_profile else None
+        display_name = user.email.split("@", 1)[0] if user else candidate.athlete_id
+        return LeaderboardEntryDTO(
+            rank=rank,
+            athleteId=candidate.athlete_id,
+            displayName=display_name,
+            bestScoreNorm=round(candidate.score_norm, 2),
         )
-        for entry in dto.entries:
-            best_attempt_id = next(
-                (
-                    attempt.id
-                    for attempt in self.attempts.values()
-                    if attempt.athlete_id == entry.athlete_id
-                    and attempt.workout_definition_id == workout_id
-                    and attempt.scale_code == scale_code
-                    and attempt.status == AttemptStatus.VALIDATED
-                ),
-                "",
-            )
-            leaderboard.entries.append(
-                LeaderboardEntryRecord(
-                    leaderboard_id=leaderboard.id,
-                    athlete_id=entry.athlete_id,
-                    best_attempt_id=best_attempt_id,
-                    best_score_norm=entry.best_score_norm,
-                    rank=entry.rank,
-                    updated_at=_now(),
-                )
-            )
-        self.leaderboards[key] = leaderboard
 
     def _movement_to_dto(self, movement: MovementRecord) -> MovementDTO:
         return MovementDTO(
@@ -2144,9 +2726,6 @@ class RuntimeService:
 
     def _attempt_to_dto(self, attempt: WorkoutAttemptRecord) -> AttemptDTO:
         result = self._result_by_attempt(attempt.id)
-        impact_breakdown = None
-        if result is not None:
-            impact_breakdown = result.derived_metrics_json.get("impactBreakdown")
         return AttemptDTO(
             id=attempt.id,
             athleteId=attempt.athlete_id,
@@ -2155,7 +2734,7 @@ class RuntimeService:
             scaleCode=attempt.scale_code,
             status=attempt.status,
             scoreNorm=round(result.score_norm, 2) if result is not None else None,
-            impactBreakdown=impact_breakdown,
+            impactBreakdown=result.impact_breakdown if result is not None else None,
         )
 
     def _workout_mutation_to_dto(self, workout: WorkoutDefinitionRecord) -> WorkoutMutationResponseDTO:
@@ -2183,6 +2762,7 @@ class RuntimeService:
 
 
 _RUNTIME_SERVICE: RuntimeService | None = None
+_BASELINE_SNAPSHOT: RuntimeSnapshot | None = None
 
 
 def get_runtime_service() -> RuntimeService:
@@ -2193,6 +2773,11 @@ def get_runtime_service() -> RuntimeService:
 
 
 def reset_runtime_service() -> RuntimeService:
+    global _BASELINE_SNAPSHOT
     service = get_runtime_service()
-    service.reset()
+    if _BASELINE_SNAPSHOT is None:
+        service.reset()
+        _BASELINE_SNAPSHOT = service.snapshot()
+    else:
+        service.restore(_BASELINE_SNAPSHOT)
     return service
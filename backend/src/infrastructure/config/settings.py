@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expires_minutes: int = 30
     refresh_token_expires_days: int = 30
+    password_hasher_workers: int = 4
+    access_token_cache_size: int = 10000
+    rankings_recompute_chunk_size: int = 25
+    leaderboard_cache_size: int = 1024
+    admin_job_retention_minutes: int = 60
 
     model_config = SettingsConfigDict(
         env_file=".env",
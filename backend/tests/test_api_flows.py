@@ -1,6 +1,17 @@
+import math
+from datetime import timedelta
+
+import pytest
 from fastapi.testclient import TestClient
 from jose import jwt
 
+from src.adapters.outbound.persistence.models.enums import (
+    CapacityType,
+    LeaderboardPeriod,
+    LeaderboardScope,
+    ScaleCode,
+)
+from src.application.services import runtime_service
 from src.application.services.runtime_service import get_runtime_service
 from src.infrastructure.config.settings import get_settings
 
@@ -67,6 +78,13 @@ def test_auth_login_refresh_logout_me(client: TestClient) -> None:
     assert refresh_response.status_code == 200
     assert "accessToken" in refresh_response.json()
 
+    _login(client, "athlete@local.com", "Athlete123!")
+    reused = client.post("/api/v1/auth/refresh", json={"refreshToken": refresh_token})
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Refresh token expired"
+    unknown = client.post("/api/v1/auth/refresh", json={"refreshToken": "unknown"})
+    assert unknown.json()["detail"] == "Invalid refresh token"
+
     logout_response = client.post(
         "/api/v1/auth/logout",
         json={"refreshToken": refresh_token},
@@ -76,6 +94,40 @@ def test_auth_login_refresh_logout_me(client: TestClient) -> None:
     assert logout_response.json() == {"status": "ok"}
 
 
+def test_sessions_listing_and_logout_all(client: TestClient) -> None:
+    first_login = _login(client, "athlete@local.com", "Athlete123!")
+    second_login = _login(client, "athlete@local.com", "Athlete123!")
+    headers = _auth_headers(second_login["accessToken"])
+
+    sessions_response = client.get("/api/v1/auth/sessions", headers=headers)
+    assert sessions_response.status_code == 200
+    sessions = sessions_response.json()
+    assert len(sessions) == 2
+    assert {"id", "createdAt", "expiresAt"} <= set(sessions[0])
+
+    logout_response = client.post("/api/v1/auth/logout", json={}, headers=headers)
+    assert logout_response.status_code == 200
+
+    assert client.get("/api/v1/auth/sessions", headers=headers).json() == []
+    refresh_response = client.post("/api/v1/auth/refresh", json={"refreshToken": first_login["refreshToken"]})
+    assert refresh_response.status_code == 401
+
+
+def test_repeated_requests_with_same_access_token_hit_verified_token_cache(client: TestClient) -> None:
+    login = _login(client, "athlete@local.com", "Athlete123!")
+    admin_headers = _auth_headers(_login(client, "admin@local.com", "Admin123!")["accessToken"])
+    before = client.get("/api/v1/admin/cache-stats", headers=admin_headers).json()["accessTokens"]
+
+    for _ in range(3):
+        assert client.get("/api/v1/me", headers=_auth_headers(login["accessToken"])).status_code == 200
+
+    after = client.get("/api/v1/admin/cache-stats", headers=admin_headers).json()["accessTokens"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 3
+    assert after["entries"] == before["entries"] + 1
+    assert client.get("/api/v1/admin/cache-stats", headers=_auth_headers(login["accessToken"])).status_code == 403
+
+
 def test_me_returns_401_with_expired_access_token(client: TestClient) -> None:
     service = get_runtime_service()
     settings = get_settings()
@@ -97,16 +149,17 @@ def test_invite_flow(client: TestClient) -> None:
 
     service = get_runtime_service()
     coach_user = next(user for user in service.users.values() if user.email == "coach@local.com")
-    coach_gym_id = service._coach_gym_id(coach_user.id)  # noqa: SLF001
+    coach_gym_id = service._coach_gym_id(coach_user.id)
     assert coach_gym_id is not None
 
     invite_response = client.post(
         "/api/v1/auth/invitations",
-        json={"email": "new-athlete@local.com", "gymId": coach_gym_id},
+        json={"email": "New-Athlete@LOCAL.com", "gymId": coach_gym_id},
         headers=_auth_headers(coach_access),
     )
     assert invite_response.status_code == 200
     token = invite_response.json()["token"]
+    assert service.invitations[invite_response.json()["invitationId"]].email == "new-athlete@local.com"
 
     register_response = client.post(
         "/api/v1/auth/register-from-invite",
@@ -118,6 +171,31 @@ def test_invite_flow(client: TestClient) -> None:
     )
     assert register_response.status_code == 200
     assert register_response.json()["role"] == "ATHLETE"
+    me = client.get("/api/v1/me", headers=_auth_headers(register_response.json()["accessToken"])).json()
+    assert me["email"] == "new-athlete@local.com"
+
+
+def test_login_email_lookup_is_case_insensitive_and_invites_reject_registered_email(client: TestClient) -> None:
+    login = _login(client, "  Athlete@LOCAL.com", "Athlete123!")
+    assert login["role"] == "ATHLETE"
+
+    coach_login = _login(client, "coach@local.com", "Coach123!")
+    service = get_runtime_service()
+    coach_user = next(user for user in service.users.values() if user.email == "coach@local.com")
+    coach_gym_id = service._coach_gym_id(coach_user.id)
+
+    invite_response = client.post(
+        "/api/v1/auth/invitations",
+        json={"email": "ATHLETE@local.com", "gymId": coach_gym_id},
+        headers=_auth_headers(coach_login["accessToken"]),
+    )
+    assert invite_response.status_code == 200
+
+    register_response = client.post(
+        "/api/v1/auth/register-from-invite",
+        json={"token": invite_response.json()["token"], "password": "Other123!", "athlete": {}},
+    )
+    assert register_response.status_code == 409
 
 
 def test_create_workout_create_attempt_submit_validate_dashboard(client: TestClient) -> None:
@@ -343,6 +421,228 @@ def test_athlete_dashboard_and_rankings_schema_after_attempt_validation(client:
     assert ranking["entries"][0]["athleteId"] == dashboard["athleteId"]
 
 
+def _create_published_workout(client: TestClient, coach_headers: dict[str, str]) -> str:
+    movement_id = client.get("/api/v1/movements").json()[0]["id"]
+    workout_id = client.post(
+        "/api/v1/coach/workouts",
+        json=_build_workout_payload(movement_id),
+        headers=coach_headers,
+    ).json()["id"]
+    assert client.post(f"/api/v1/coach/workouts/{workout_id}/publish", headers=coach_headers).status_code == 200
+    return workout_id
+
+
+def _submit_validated_attempt(
+    client: TestClient,
+    workout_id: str,
+    reps: int,
+    coach_headers: dict[str, str],
+    athlete_headers: dict[str, str],
+) -> str:
+    attempt_id = client.post(
+        f"/api/v1/athlete/workouts/{workout_id}/attempt",
+        json={"scaleCode": "RX"},
+        headers=athlete_headers,
+    ).json()["attemptId"]
+    submit_response = client.post(
+        f"/api/v1/athlete/attempts/{attempt_id}/submit-result",
+        json={"primaryResult": {"type": "REPS", "repsTotal": reps}, "inputs": {"loadKgTotal": 1}},
+        headers=athlete_headers,
+    )
+    assert submit_response.status_code == 200
+    assert client.post(f"/api/v1/coach/attempts/{attempt_id}/validate", headers=coach_headers).status_code == 200
+    return attempt_id
+
+
+def test_rankings_fall_back_when_validated_attempt_is_rejected(client: TestClient) -> None:
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_headers = _auth_headers(_login(client, "athlete@local.com", "Athlete123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+
+    attempt_ids = [
+        _submit_validated_attempt(client, workout_id, reps, coach_headers, athlete_headers) for reps in (60, 90)
+    ]
+
+    params = {"workoutId": workout_id, "scope": "COMMUNITY", "period": "ALL_TIME", "scaleCode": "RX"}
+    best_score = client.get("/api/v1/rankings", params=params).json()["entries"][0]["bestScoreNorm"]
+
+    reject_response = client.post(
+        f"/api/v1/coach/attempts/{attempt_ids[1]}/reject",
+        json={"reason": "No rep"},
+        headers=coach_headers,
+    )
+    assert reject_response.status_code == 200
+
+    entries = client.get("/api/v1/rankings", params=params).json()["entries"]
+    assert len(entries) == 1
+    assert entries[0]["bestScoreNorm"] < best_score
+
+
+def test_incremental_capacities_match_full_rebuild(client: TestClient) -> None:
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_login = _login(client, "athlete@local.com", "Athlete123!")
+    athlete_headers = _auth_headers(athlete_login["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+
+    for reps in (60, 90, 75):
+        _submit_validated_attempt(client, workout_id, reps, coach_headers, athlete_headers)
+
+    service = get_runtime_service()
+    athlete_id = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()["athleteId"]
+    incremental = {key: record.value_0_100 for key, record in service.capacities.items() if key[0] == athlete_id}
+    service._capacity_statistics.pop(athlete_id)
+    service._recalculate_capacities_and_pulse(athlete_id)
+
+    for key, value in incremental.items():
+        assert service.capacities[key].value_0_100 == pytest.approx(value)
+
+
+def test_editing_an_unrelated_workout_keeps_dashboard_decay(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_headers = _auth_headers(_login(client, "athlete@local.com", "Athlete123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+    _submit_validated_attempt(client, workout_id, 60, coach_headers, athlete_headers)
+
+    service = get_runtime_service()
+    athlete_id = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()["athleteId"]
+    statistics = service._capacity_statistics[athlete_id]
+    movement_id = client.get("/api/v1/movements").json()[0]["id"]
+    payload = _build_workout_payload(movement_id)
+    other_id = client.post("/api/v1/coach/workouts", json=payload, headers=coach_headers).json()["id"]
+    assert client.put(f"/api/v1/coach/workouts/{other_id}", json=payload, headers=coach_headers).status_code == 200
+    assert service._capacity_statistics[athlete_id] is statistics
+
+    before = service.capacities[(athlete_id, CapacityType.STRENGTH)].value_0_100
+    later = runtime_service._now() + timedelta(days=60)
+    monkeypatch.setattr(runtime_service, "_now", lambda: later)
+    dashboard = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()
+    values = {item["type"]: item["value"] for item in dashboard["capacities"]}
+    assert values[CapacityType.STRENGTH.value] == pytest.approx(before * math.exp(-1.0), abs=0.01)
+    assert dashboard["pulse"]["value"] == pytest.approx(sum(values.values()) / len(values), abs=0.01)
+    assert dashboard["pulse"]["computedAt"] == runtime_service._iso(later)
+    assert {item["confidence"] for item in dashboard["capacities"]} == {dashboard["pulse"]["confidence"]}
+
+    assert client.put(f"/api/v1/coach/workouts/{workout_id}", json=payload, headers=coach_headers).status_code == 200
+    assert athlete_id not in service._capacity_statistics
+
+
+def test_admin_capacity_refresh_decays_inactive_athletes(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    admin_headers = _auth_headers(_login(client, "admin@local.com", "Admin123!")["accessToken"])
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_headers = _auth_headers(_login(client, "athlete@local.com", "Athlete123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+    _submit_validated_attempt(client, workout_id, 60, coach_headers, athlete_headers)
+
+    service = get_runtime_service()
+    athlete_id = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()["athleteId"]
+    gym_id = service.athlete_profiles[athlete_id].current_gym_id
+    key = (athlete_id, CapacityType.STRENGTH)
+    before = service.capacities[key].value_0_100
+    later = runtime_service._now() + timedelta(days=30)
+    monkeypatch.setattr(runtime_service, "_now", lambda: later)
+
+    dashboard = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()
+    strength = next(item for item in dashboard["capacities"] if item["type"] == CapacityType.STRENGTH.value)
+    assert strength["value"] == pytest.approx(before * math.exp(-0.5), abs=0.01)
+    assert service.capacities[key].value_0_100 == before
+
+    assert client.post("/api/v1/admin/capacities/refresh", headers=coach_headers).status_code == 403
+    missing_gym = client.post("/api/v1/admin/capacities/refresh", params={"gymId": "missing"}, headers=admin_headers)
+    assert missing_gym.status_code == 404
+    response = client.post("/api/v1/admin/capacities/refresh", params={"gymId": gym_id}, headers=admin_headers)
+    assert response.status_code == 200
+
+    job = client.get(f"/api/v1/admin/capacities/refresh/{response.json()['jobId']}", headers=admin_headers).json()
+    assert job["status"] == "ok"
+    assert job["processedGyms"] == job["totalGyms"] == 1
+    assert job["refreshedAthletes"] >= 1
+    assert service.capacities[key].value_0_100 == pytest.approx(before * math.exp(-0.5), rel=1e-3)
+    assert service.pulses[athlete_id].computed_at == later
+
+    dashboard = client.get("/api/v1/athlete/dashboard", headers=athlete_headers).json()
+    trend = next(item for item in dashboard["trends30d"] if item["type"] == CapacityType.STRENGTH.value)
+    assert trend["delta"] == pytest.approx(before * (math.exp(-0.5) - 1.0), abs=0.01)
+    assert [recorded_at for recorded_at, _ in service.capacity_history.entries(*key)][-1] == later
+
+
+def test_admin_recompute_rankings_records_winning_attempt(client: TestClient) -> None:
+    admin_headers = _auth_headers(_login(client, "admin@local.com", "Admin123!")["accessToken"])
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_headers = _auth_headers(_login(client, "athlete@local.com", "Athlete123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+    _submit_validated_attempt(client, workout_id, 60, coach_headers, athlete_headers)
+    best_attempt_id = _submit_validated_attempt(client, workout_id, 90, coach_headers, athlete_headers)
+
+    response = client.post("/api/v1/admin/rankings/recompute", headers=admin_headers)
+    assert response.status_code == 200
+    job_id = response.json()["jobId"]
+
+    status_response = client.get(f"/api/v1/admin/rankings/recompute/{job_id}", headers=admin_headers)
+    assert status_response.status_code == 200
+    job = status_response.json()
+
+    service = get_runtime_service()
+    assert job["status"] == "ok"
+    assert job["processedWorkouts"] == job["totalWorkouts"] == len(service.workouts)
+    assert job["recomputed"] == len(service._leaderboard_index)
+    assert client.get("/api/v1/admin/rankings/recompute/missing", headers=admin_headers).status_code == 404
+    assert client.get(f"/api/v1/admin/rankings/recompute/{job_id}", headers=coach_headers).status_code == 403
+    community = service._leaderboard_index.board(
+        (workout_id, LeaderboardScope.COMMUNITY, None, LeaderboardPeriod.ALL_TIME, ScaleCode.RX)
+    )
+    assert [candidate.attempt_id for candidate in community.entries()] == [best_attempt_id]
+
+
+def test_rankings_response_cache_patches_my_rank_and_invalidates_on_validation(client: TestClient) -> None:
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    athlete_headers = _auth_headers(_login(client, "athlete@local.com", "Athlete123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+    _submit_validated_attempt(client, workout_id, 60, coach_headers, athlete_headers)
+    params = {"workoutId": workout_id, "scope": "COMMUNITY", "period": "ALL_TIME", "scaleCode": "RX"}
+    admin_headers = _auth_headers(_login(client, "admin@local.com", "Admin123!")["accessToken"])
+    before = client.get("/api/v1/admin/cache-stats", headers=admin_headers).json()["leaderboards"]
+
+    athlete_view = client.get("/api/v1/rankings", params=params, headers=athlete_headers).json()
+    anonymous_view = client.get("/api/v1/rankings", params=params).json()
+
+    after = client.get("/api/v1/admin/cache-stats", headers=admin_headers).json()["leaderboards"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+    assert athlete_view["myRank"] == 1
+    assert len(athlete_view["neighbors"]) == 1
+    assert anonymous_view["myRank"] is None
+    assert anonymous_view["entries"] == athlete_view["entries"]
+
+    _submit_validated_attempt(client, workout_id, 90, coach_headers, athlete_headers)
+
+    refreshed = client.get("/api/v1/rankings", params=params).json()
+    assert refreshed["entries"][0]["bestScoreNorm"] > athlete_view["entries"][0]["bestScoreNorm"]
+
+    service = get_runtime_service()
+    first = service.get_rankings(workout_id, LeaderboardScope.COMMUNITY, LeaderboardPeriod.ALL_TIME, ScaleCode.RX, None)
+    second = service.get_rankings(workout_id, LeaderboardScope.COMMUNITY, LeaderboardPeriod.ALL_TIME, ScaleCode.RX, None)
+    assert first is not second
+    assert first.entries is second.entries
+
+
+def test_rankings_pagination_parameters(client: TestClient) -> None:
+    coach_headers = _auth_headers(_login(client, "coach@local.com", "Coach123!")["accessToken"])
+    workout_id = _create_published_workout(client, coach_headers)
+    params = {"workoutId": workout_id, "scope": "COMMUNITY", "period": "ALL_TIME", "scaleCode": "RX", "limit": 10}
+
+    ranking = client.get("/api/v1/rankings", params=params).json()
+    assert ranking["entries"] == []
+    assert ranking["total"] == 0
+    assert ranking["nextCursor"] is None
+    assert ranking["neighbors"] == []
+
+    assert client.get("/api/v1/rankings", params={**params, "limit": 0}).status_code == 422
+    assert client.get("/api/v1/rankings", params={**params, "cursor": "bogus"}).status_code == 400
+    assert client.get("/api/v1/rankings", params={**params, "cursor": "bogus", "offset": 1}).status_code == 400
+
+
 def test_ideal_scores_permissions_and_upserts(client: TestClient) -> None:
     coach_login = _login(client, "coach@local.com", "Coach123!")
     coach_headers = _auth_headers(coach_login["accessToken"])
@@ -360,7 +660,7 @@ def test_ideal_scores_permissions_and_upserts(client: TestClient) -> None:
 
     service = get_runtime_service()
     coach_user = next(user for user in service.users.values() if user.email == "coach@local.com")
-    coach_gym_id = service._coach_gym_id(coach_user.id)  # noqa: SLF001
+    coach_gym_id = service._coach_gym_id(coach_user.id)
     assert coach_gym_id is not None
 
     coach_gym_ideal_response = client.put(
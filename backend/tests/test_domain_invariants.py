@@ -1,26 +1,46 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from datetime import timedelta
+
 import pytest
 
 from src.adapters.outbound.persistence.models.enums import (
     AttemptStatus,
     CapacityType,
+    DataQuality,
+    GymRole,
     LeaderboardPeriod,
     LeaderboardScope,
+    MovementPattern,
+    MovementUnit,
     ScaleCode,
     ScoreType,
     WorkoutType,
     WorkoutVisibility,
 )
+from src.application.dtos.admin import (
+    AdminChangeGymRequestDTO,
+    AdminCreateMovementRequestDTO,
+)
+from src.application.dtos.athlete import CreateAttemptRequestDTO, SubmitResultRequestDTO
 from src.application.dtos.coach import (
     WorkoutBlockInputDTO,
     WorkoutBlockMovementInputDTO,
     WorkoutCapacityWeightInputDTO,
     WorkoutCreateRequestDTO,
     WorkoutScaleInputDTO,
+    WorkoutUpdateRequestDTO,
 )
+from src.application.services import runtime_service
+from src.application.services.capacity_statistics import CapacityStatistics
 from src.application.services.runtime_service import (
+    _STATE_ATTRIBUTES,
+    ConflictError,
+    ForbiddenError,
+    RuntimeService,
     ValidationServiceError,
+    WorkoutResultRecord,
     get_runtime_service,
     reset_runtime_service,
 )
@@ -77,7 +97,7 @@ def _seed_attempt(*, is_test: bool, score_norm: float, status: AttemptStatus) ->
     service = get_runtime_service()
     coach = next(user for user in service.users.values() if user.email == "coach@local.com")
     athlete = next(user for user in service.users.values() if user.email == "athlete@local.com")
-    athlete_profile = service._athlete_profile_by_user(athlete.id)  # noqa: SLF001
+    athlete_profile = service._athlete_profile_by_user(athlete.id)
     assert athlete_profile is not None
 
     workout_payload = _build_workout_payload(is_test=is_test, score_type=ScoreType.REPS)
@@ -87,7 +107,7 @@ def _seed_attempt(*, is_test: bool, score_norm: float, status: AttemptStatus) ->
     attempt_record = service.attempts[attempt.attempt_id]
     attempt_record.status = status
 
-    result = service._result_by_attempt(attempt.attempt_id)  # noqa: SLF001
+    result = service._result_by_attempt(attempt.attempt_id)
     assert result is not None
     result.score_norm = score_norm
 
@@ -99,7 +119,7 @@ def test_only_is_test_workouts_alter_capacities() -> None:
     athlete_id, _ = _seed_attempt(is_test=False, score_norm=100.0, status=AttemptStatus.VALIDATED)
     service = get_runtime_service()
 
-    service._recalculate_capacities_and_pulse(athlete_id)  # noqa: SLF001
+    service._recalculate_capacities_and_pulse(athlete_id)
 
     for capacity in CapacityType:
         record = service.capacities[(athlete_id, capacity)]
@@ -111,16 +131,11 @@ def test_non_validated_attempts_do_not_affect_ranking() -> None:
     _, workout_id = _seed_attempt(is_test=True, score_norm=80.0, status=AttemptStatus.SUBMITTED)
     service = get_runtime_service()
 
-    leaderboard = service._compute_leaderboard(  # noqa: SLF001
-        workout_id=workout_id,
-        scope=LeaderboardScope.COMMUNITY,
-        gym_id=None,
-        period=LeaderboardPeriod.ALL_TIME,
-        scale_code=ScaleCode.RX,
-        current_user=None,
+    board = service._leaderboard_index.board(
+        (workout_id, LeaderboardScope.COMMUNITY, None, LeaderboardPeriod.ALL_TIME, ScaleCode.RX)
     )
 
-    assert leaderboard.entries == []
+    assert board is None or board.entries() == []
 
 
 def test_capacity_weights_sum_must_be_one() -> None:
@@ -135,7 +150,7 @@ def test_capacity_weights_sum_must_be_one() -> None:
     ]
 
     with pytest.raises(ValidationServiceError, match="sum must be 1.00"):
-        service._validate_capacity_weights(True, bad_weights)  # noqa: SLF001
+        service._validate_capacity_weights(True, bad_weights)
 
 
 def test_score_type_is_required_for_test_workouts() -> None:
@@ -147,3 +162,410 @@ def test_score_type_is_required_for_test_workouts() -> None:
 
     with pytest.raises(ValidationServiceError, match="scoreType is required"):
         service.create_workout(coach, payload)
+
+
+def test_snapshot_state_attributes_cover_everything_reset_builds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(RuntimeService, "reset", lambda self: None)
+    service = RuntimeService()
+    collaborators = set(vars(service))
+    monkeypatch.undo()
+
+    service.reset()
+
+    assert set(vars(service)) - collaborators == set(_STATE_ATTRIBUTES)
+    assert len(_STATE_ATTRIBUTES) == len(set(_STATE_ATTRIBUTES))
+
+
+def test_snapshot_restore_rolls_back_state_and_shares_movements() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    snapshot = service.snapshot()
+    workouts_before = set(service.workouts)
+
+    service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS))
+    assert set(service.workouts) != workouts_before
+
+    service.restore(snapshot)
+
+    assert set(service.workouts) == workouts_before
+    assert all(service.movements[movement_id] is movement for movement_id, movement in snapshot.state["movements"].items())
+    assert service._get_user_by_email("coach@local.com") is service.users[coach.id]
+
+
+def test_membership_change_keeps_single_active_membership_per_user() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    athlete = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    other_gym_id = "gym-secondary"
+
+    service._upsert_membership(athlete.id, other_gym_id, GymRole.ATHLETE)
+
+    active = [item for item in service.memberships.values() if item.user_id == athlete.id and item.active]
+    assert [item.gym_id for item in active] == [other_gym_id]
+    assert service._active_membership_by_user[athlete.id] is active[0]
+
+
+def test_athlete_profile_index_is_unique_per_user() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    athlete = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    profile = service._athlete_profile_by_user(athlete.id)
+    assert profile is not None
+    assert service.athlete_profiles[profile.id] is profile
+
+    with pytest.raises(ConflictError):
+        service._add_athlete_profile(replace(profile, id="duplicate-profile"))
+
+
+def test_gym_athlete_index_follows_admin_gym_change() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    athlete_user = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    profile = service._athlete_profile_by_user(athlete_user.id)
+    assert profile is not None
+    previous_gym_id = profile.current_gym_id
+    assert profile.id in service._athlete_ids_by_gym[previous_gym_id]
+    assert profile.id in {item.athlete_id for item in service.coach_athletes(coach)}
+
+    service.gyms["gym-secondary"] = replace(service.gyms[previous_gym_id], id="gym-secondary", name="Secondary")
+    service.admin_change_athlete_gym(admin, profile.id, AdminChangeGymRequestDTO(gym_id="gym-secondary"))
+
+    assert profile.id not in service._athlete_ids_by_gym.get(previous_gym_id, set())
+    assert profile.id in service._athlete_ids_by_gym["gym-secondary"]
+    assert profile.id not in {item.athlete_id for item in service.coach_athletes(coach)}
+
+
+def test_workout_visibility_index_tracks_publish_and_gym_change() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    athlete_user = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    profile = service._athlete_profile_by_user(athlete_user.id)
+    assert profile is not None
+    workout = service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS))
+
+    with pytest.raises(ForbiddenError):
+        service.get_workout_detail(athlete_user, workout.id)
+
+    service.publish_workout(coach, workout.id)
+    assert workout.id in {item.id for item in service.list_workouts(athlete_user)}
+    assert service.get_workout_detail(athlete_user, workout.id).id == workout.id
+
+    service.gyms["gym-secondary"] = replace(service.gyms[profile.current_gym_id], id="gym-secondary", name="Secondary")
+    service.admin_change_athlete_gym(admin, profile.id, AdminChangeGymRequestDTO(gym_id="gym-secondary"))
+    assert workout.id not in {item.id for item in service.list_workouts(athlete_user)}
+
+    service.delete_workout(coach, workout.id)
+    assert all(workout.id not in ids for ids in service._gym_workout_ids.values())
+    assert not service.assignments
+
+
+def test_result_index_is_unique_per_attempt() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    result = WorkoutResultRecord(
+        id="result-1",
+        attempt_id="attempt-1",
+        primary_result_json={},
+        inputs_json={},
+        derived_metrics_json={},
+        score_base=10.0,
+        score_norm=50.0,
+        data_quality=DataQuality.OK,
+        validated_by_user_id=None,
+        validated_at=None,
+        reject_reason=None,
+    )
+
+    service._add_result(result)
+
+    assert service._result_by_attempt("attempt-1") is result
+    with pytest.raises(ConflictError):
+        service._add_result(replace(result, id="result-2"))
+
+
+def test_workout_scale_index_tracks_validation_and_guards_delete() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    athlete_user = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    workout = service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS))
+    service.publish_workout(coach, workout.id)
+    attempt = service.create_attempt(athlete_user, workout.id, CreateAttemptRequestDTO(scale_code=ScaleCode.RX))
+    record = service.attempts[attempt.attempt_id]
+
+    service._set_attempt_status(record, AttemptStatus.VALIDATED)
+    assert service._validated_attempts(workout.id, ScaleCode.RX) == [record]
+    assert service._validated_attempts(workout.id, ScaleCode.SCALED) == []
+
+    service._set_attempt_status(record, AttemptStatus.REJECTED)
+    assert service._validated_attempts(workout.id, ScaleCode.RX) == []
+    with pytest.raises(ConflictError):
+        service.delete_workout(coach, workout.id)
+
+
+def test_workout_derived_metrics_are_memoized_per_version() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    payload = _build_workout_payload(is_test=True, score_type=ScoreType.REPS)
+    workout = service.workouts[service.create_workout(coach, payload).id]
+
+    weights = service._capacity_weights(workout)
+    breakdown = service._impact_breakdown(workout)
+    assert service._capacity_weights(workout) is weights
+    assert service._impact_breakdown(workout) is breakdown
+
+    update = WorkoutUpdateRequestDTO.model_validate(payload.model_dump())
+    update.capacity_weights = [
+        WorkoutCapacityWeightInputDTO(capacity_type=capacity_type, weight=1.0 if capacity_type == CapacityType.STRENGTH else 0.0)
+        for capacity_type in CapacityType
+    ]
+    service.update_workout(coach, workout.id, update)
+    assert service._capacity_weights(workout)[CapacityType.STRENGTH] == 1.0
+    assert service._impact_breakdown(workout) is not breakdown
+
+
+def test_creating_a_movement_does_not_rederive_existing_workouts() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    workout = service.workouts[
+        service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS)).id
+    ]
+    derived = service._workout_derived(workout)
+    weights = service._capacity_weights(workout)
+
+    service.admin_create_movement(
+        admin,
+        AdminCreateMovementRequestDTO.model_validate(
+            {"name": "Bench Sled Drag", "pattern": MovementPattern.CARRY, "unitPrimary": MovementUnit.METERS}
+        ),
+    )
+
+    assert service._workout_derived(workout) is derived
+    assert service._capacity_weights(workout) is weights
+
+
+def test_workout_derived_metrics_follow_referenced_movement_versions() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    first_movement_id, second_movement_id = list(service.movements)[:2]
+    payload = _build_workout_payload(is_test=True, score_type=ScoreType.REPS)
+    workout = service.workouts[service.create_workout(coach, payload).id]
+    payload.blocks[0].movements[0].movement_id = second_movement_id
+    other = service.workouts[service.create_workout(coach, payload).id]
+    derived = service._workout_derived(workout)
+    other_derived = service._workout_derived(other)
+
+    movement = service.movements[first_movement_id]
+    service.movements[first_movement_id] = replace(movement, version=movement.version + 1)
+
+    assert service._workout_derived(other) is other_derived
+    assert service._workout_derived(workout) is not derived
+    assert service._workout_derived(workout).stamp == (workout.version, (1,))
+
+
+def test_results_share_one_impact_breakdown_per_workout_version() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    athlete_user = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    workout = service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS))
+    service.publish_workout(coach, workout.id)
+    payload = SubmitResultRequestDTO.model_validate(
+        {"primaryResult": {"type": "REPS", "repsTotal": 40}, "inputs": {"loadKgTotal": 1}}
+    )
+
+    submitted = []
+    for _ in range(2):
+        attempt = service.create_attempt(athlete_user, workout.id, CreateAttemptRequestDTO(scale_code=ScaleCode.RX))
+        submitted.append(service.submit_attempt_result(athlete_user, attempt.attempt_id, payload))
+
+    breakdowns = [service._result_by_attempt(item.id).impact_breakdown for item in submitted]
+    assert breakdowns[0] is not None
+    assert breakdowns[0] is breakdowns[1]
+    assert all(item.impact_breakdown is breakdowns[0] for item in submitted)
+
+
+def test_building_an_impact_breakdown_leaves_snapshots_untouched() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    workout = service.workouts[
+        service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS)).id
+    ]
+    derived = service._workout_derived(workout)
+    snapshot = service.snapshot()
+
+    breakdown = service._impact_breakdown(workout)
+
+    assert snapshot.state["_workout_derived_metrics"][workout.id] is derived
+    assert derived.impact_breakdown is None
+    assert service._workout_derived_metrics[workout.id].impact_breakdown is breakdown
+    assert service._capacity_weights(workout) is derived.capacity_weights
+
+
+def test_recompute_job_swaps_leaderboards_only_after_last_chunk(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    coach = next(user for user in service.users.values() if user.email == "coach@local.com")
+    athlete_user = next(user for user in service.users.values() if user.email == "athlete@local.com")
+    workouts = [
+        service.create_workout(coach, _build_workout_payload(is_test=True, score_type=ScoreType.REPS)) for _ in range(3)
+    ]
+    for workout in workouts:
+        service.publish_workout(coach, workout.id)
+    payload = SubmitResultRequestDTO.model_validate(
+        {"primaryResult": {"type": "REPS", "repsTotal": 40}, "inputs": {"loadKgTotal": 1}}
+    )
+    attempts = []
+    for workout in workouts[:2]:
+        attempt = service.create_attempt(athlete_user, workout.id, CreateAttemptRequestDTO(scale_code=ScaleCode.RX))
+        service.submit_attempt_result(athlete_user, attempt.attempt_id, payload)
+        attempts.append(attempt)
+    service.validate_attempt(coach, attempts[0].attempt_id)
+
+    key = (workouts[0].id, LeaderboardScope.COMMUNITY, None, LeaderboardPeriod.ALL_TIME, ScaleCode.RX)
+    previous_index = service._leaderboard_index
+    previous_version = previous_index.board(key).version
+    monkeypatch.setattr(service._settings, "rankings_recompute_chunk_size", 1)
+    original = RuntimeService._stage_workout_leaderboards
+    seen_during_run: list[bool] = []
+
+    def tracking(self, *args, **kwargs):
+        seen_during_run.append(self._leaderboard_index is previous_index)
+        if len(seen_during_run) == 1:
+            self.validate_attempt(coach, attempts[1].attempt_id)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(RuntimeService, "_stage_workout_leaderboards", tracking)
+    job = service.start_rankings_recompute(admin)
+    assert job.status == "queued"
+
+    service.run_rankings_recompute(job.job_id or "")
+
+    assert seen_during_run and all(seen_during_run[: len(service.workouts)])
+    index = service._leaderboard_index
+    assert index is not previous_index
+    assert index.board(key).version > previous_version
+    mid_job_key = (workouts[1].id, LeaderboardScope.COMMUNITY, None, LeaderboardPeriod.ALL_TIME, ScaleCode.RX)
+    assert [candidate.attempt_id for candidate in index.board(mid_job_key).entries()] == [attempts[1].attempt_id]
+    finished = service.get_rankings_recompute_job(admin, job.job_id or "")
+    assert finished.status == "ok"
+    assert finished.processed_workouts == finished.total_workouts == len(service.workouts)
+
+
+def test_finished_admin_jobs_are_pruned_and_reset_cancels_active_ones() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    finished = service.recompute_rankings(admin)
+    refreshed = service.refresh_capacities(admin)
+    retention = timedelta(minutes=service._settings.admin_job_retention_minutes)
+    service._recompute_jobs[finished.job_id or ""].finished_at -= retention * 2
+    service._capacity_refresh_jobs[refreshed.job_id].finished_at -= retention * 2
+
+    queued = service.start_rankings_recompute(admin)
+    pending = service.start_capacity_refresh(admin)
+    assert list(service._recompute_jobs) == [queued.job_id]
+    assert list(service._capacity_refresh_jobs) == [pending.job_id]
+
+    job = service._recompute_jobs[queued.job_id or ""]
+    service.reset()
+    service.run_rankings_recompute(queued.job_id or "")
+
+    assert job.status == "cancelled"
+    assert service._recompute_jobs == {}
+    assert service._capacity_refresh_jobs == {}
+
+
+def test_capacity_refresh_skips_athletes_updated_after_the_job_was_queued(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    athlete_id = next(athlete_id for athlete_id, _ in service.capacities)
+    refreshed: list[str] = []
+    original = RuntimeService._capacity_refresh_inputs
+
+    def tracking(self, athlete_id, *args, **kwargs):
+        refreshed.append(athlete_id)
+        return original(self, athlete_id, *args, **kwargs)
+
+    monkeypatch.setattr(RuntimeService, "_capacity_refresh_inputs", tracking)
+    service.refresh_capacities(admin)
+    assert refreshed == [athlete_id]
+
+    refreshed.clear()
+    job = service.start_capacity_refresh(admin)
+    created_at = service._capacity_refresh_jobs[job.job_id].created_at
+    for capacity in CapacityType:
+        record = service.capacities[(athlete_id, capacity)]
+        service.capacities[(athlete_id, capacity)] = replace(record, last_updated_at=created_at + timedelta(seconds=1))
+    service.run_capacity_refresh(job.job_id)
+
+    assert refreshed == []
+    assert service.get_capacity_refresh_job(admin, job.job_id).status == "ok"
+
+    job = service.start_capacity_refresh(admin)
+    created_at = service._capacity_refresh_jobs[job.job_id].created_at
+    for capacity in CapacityType:
+        offset = timedelta(seconds=1 if capacity == CapacityType.STRENGTH else -1)
+        record = service.capacities[(athlete_id, capacity)]
+        service.capacities[(athlete_id, capacity)] = replace(record, last_updated_at=created_at + offset)
+    service.run_capacity_refresh(job.job_id)
+
+    assert refreshed == [athlete_id]
+
+
+def test_capacity_refresh_decays_outside_the_lock(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    athlete_id = next(athlete_id for athlete_id, _ in service.capacities)
+    anchor = runtime_service._now() - timedelta(days=10)
+    statistics = CapacityStatistics(anchor=anchor)
+    statistics.append(anchor, "attempt-1", 80.0, {CapacityType.STRENGTH: 1.0})
+    service._capacity_statistics[athlete_id] = statistics
+    lock_held: list[bool] = []
+    original = runtime_service.decayed_values
+
+    def tracking(*args, **kwargs):
+        lock_held.append(service._lock._is_owned())
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(runtime_service, "decayed_values", tracking)
+    job = service.refresh_capacities(admin)
+
+    assert lock_held == [False]
+    assert job.refreshed_athletes == 1
+    record = service.capacities[(athlete_id, CapacityType.STRENGTH)]
+    assert record.value_0_100 == pytest.approx(statistics.value_at(CapacityType.STRENGTH, record.last_updated_at))
+
+
+def test_capacity_refresh_jobs_run_per_gym_side_by_side() -> None:
+    reset_runtime_service()
+    service = get_runtime_service()
+    admin = next(user for user in service.users.values() if user.email == "admin@local.com")
+    gym_id = next(iter(service.gyms))
+    service.gyms["gym-secondary"] = replace(service.gyms[gym_id], id="gym-secondary", name="Secondary")
+
+    first = service.start_capacity_refresh(admin, gym_id)
+    second = service.start_capacity_refresh(admin, "gym-secondary")
+    assert first.job_id != second.job_id
+    assert service.start_capacity_refresh(admin, gym_id).job_id == first.job_id
+    assert service.start_capacity_refresh(admin).job_id in {first.job_id, second.job_id}
+
+    service.run_capacity_refresh(second.job_id)
+    service.run_capacity_refresh(first.job_id)
+    assert service.get_capacity_refresh_job(admin, first.job_id).status == "ok"
+    platform = service.refresh_capacities(admin)
+    assert platform.status == "ok"
+    assert platform.processed_gyms == platform.total_gyms
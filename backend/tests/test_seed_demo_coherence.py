@@ -160,3 +160,13 @@ def test_seed_demo_athletes_with_completed_tests_have_capacities(client: TestCli
         assert all(capacity.value >= 0 for capacity in profile_capacities)
         assert profile.current_gym_id in service.gyms
         assert profile.level >= 1
+
+
+def test_seed_reset_reuses_demo_password_hashes(client: TestClient) -> None:
+    service = get_runtime_service()
+    hashes_before = sorted(user.password_hash for user in service.users.values())
+
+    service.reset()
+
+    assert sorted(user.password_hash for user in service.users.values()) == hashes_before
+    _login(client, "coach@local.com", "Coach123!")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from src.application.services.access_token_cache import (
+    AccessTokenCache,
+    CachedAccessToken,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _entry(user_id: str, expires_at: float = 2000.0) -> CachedAccessToken:
+    return CachedAccessToken(user_id=user_id, expires_at=expires_at, claims={"sub": user_id})
+
+
+def test_cache_counts_hits_and_misses_and_expires_at_exp() -> None:
+    cache = AccessTokenCache(max_entries=10)
+    cache.put("token-a", _entry("user-1", expires_at=1000.0))
+
+    assert cache.get("token-a", now=999.0) is not None
+    assert cache.get("token-a", now=1000.0) is None
+    assert cache.get("token-b", now=999.0) is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 2}
+
+
+def test_cache_evicts_least_recently_used_entry() -> None:
+    cache = AccessTokenCache(max_entries=2)
+    cache.put("token-a", _entry("user-1"))
+    cache.put("token-b", _entry("user-2"))
+    cache.get("token-a", now=0.0)
+
+    cache.put("token-c", _entry("user-3"))
+
+    assert cache.get("token-b", now=0.0) is None
+    assert cache.get("token-a", now=0.0) is not None
+    assert cache.get("token-c", now=0.0) is not None
+
+
+def test_invalidate_user_drops_only_that_users_tokens() -> None:
+    cache = AccessTokenCache(max_entries=10)
+    cache.put("token-a", _entry("user-1"))
+    cache.put("token-b", _entry("user-1"))
+    cache.put("token-c", _entry("user-2"))
+
+    cache.invalidate_user("user-1")
+
+    assert len(cache) == 1
+    assert cache.get("token-c", now=0.0) is not None
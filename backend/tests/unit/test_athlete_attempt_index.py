@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.adapters.outbound.persistence.models.enums import AttemptStatus, ScaleCode
+from src.application.services.athlete_attempt_index import AthleteAttemptIndex
+from src.application.services.runtime_service import WorkoutAttemptRecord
+
+pytestmark = pytest.mark.unit
+
+
+def _attempt(attempt_id: str, performed_at: datetime, status: AttemptStatus) -> WorkoutAttemptRecord:
+    return WorkoutAttemptRecord(
+        id=attempt_id,
+        athlete_id="athlete-1",
+        workout_definition_id="workout-1",
+        assignment_id=None,
+        performed_at=performed_at,
+        scale_code=ScaleCode.RX,
+        status=status,
+    )
+
+
+def test_index_keeps_status_buckets_sorted_by_performed_at() -> None:
+    now = datetime(2026, 1, 31, tzinfo=UTC)
+    index = AthleteAttemptIndex()
+    recent = _attempt("recent", now - timedelta(days=2), AttemptStatus.SUBMITTED)
+    old = _attempt("old", now - timedelta(days=20), AttemptStatus.VALIDATED)
+    index.add(recent)
+    index.add(old)
+
+    recent.status = AttemptStatus.VALIDATED
+    index.move(recent, AttemptStatus.SUBMITTED)
+
+    assert index.attempt_ids("athlete-1", AttemptStatus.VALIDATED) == ["old", "recent"]
+    assert index.count("athlete-1", AttemptStatus.SUBMITTED) == 0
+    assert index.count_since("athlete-1", AttemptStatus.VALIDATED, now - timedelta(days=7)) == 1
+    assert index.count_since("athlete-1", AttemptStatus.VALIDATED, now - timedelta(days=30)) == 2
+    assert index.count_since("athlete-2", AttemptStatus.VALIDATED, now - timedelta(days=30)) == 0
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.adapters.outbound.persistence.models.enums import CapacityType
+from src.application.services.capacity_history import CapacityHistory
+
+pytestmark = pytest.mark.unit
+
+
+def test_baseline_is_latest_value_at_or_before_window_start() -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    history = CapacityHistory()
+    for offset, value in ((0, 10.0), (10, 20.0), (35, 30.0)):
+        history.append("athlete-1", CapacityType.STRENGTH, start + timedelta(days=offset), value)
+
+    assert history.baseline("athlete-1", CapacityType.STRENGTH, start + timedelta(days=5)) is None
+    assert history.baseline("athlete-1", CapacityType.STRENGTH, start + timedelta(days=39)) == 10.0
+    assert history.baseline("athlete-1", CapacityType.STRENGTH, start + timedelta(days=40)) == 20.0
+    assert history.baseline("athlete-1", CapacityType.WORK_CAPACITY, start + timedelta(days=40)) is None
+    assert history.baseline("athlete-2", CapacityType.STRENGTH, start + timedelta(days=40)) is None
+
+
+def test_entries_older_than_the_baseline_are_dropped() -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    history = CapacityHistory()
+    for day in range(0, 120, 5):
+        history.append("athlete-1", CapacityType.STRENGTH, start + timedelta(days=day), float(day))
+
+    entries = history.entries("athlete-1", CapacityType.STRENGTH)
+    assert [(recorded_at - start).days for recorded_at, _ in entries] == list(range(85, 120, 5))
+    assert history.baseline("athlete-1", CapacityType.STRENGTH, start + timedelta(days=115)) == 85.0
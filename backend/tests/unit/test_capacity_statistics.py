@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import math
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.adapters.outbound.persistence.models.enums import CapacityType
+from src.application.services.capacity_statistics import CapacityStatistics
+
+pytestmark = pytest.mark.unit
+
+
+def _direct_ema(samples: list[tuple[datetime, float, float]], now: datetime) -> float:
+    sequence = [
+        score * weight * math.exp(-((now - performed_at).total_seconds() / 86400.0) / 60.0)
+        for performed_at, score, weight in samples
+    ]
+    ema = sequence[0]
+    for value in sequence[1:]:
+        ema = (0.3 * value) + (0.7 * ema)
+    return ema
+
+
+def test_statistics_match_direct_decayed_ema() -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    samples = [(start + timedelta(days=offset), score, 0.6) for offset, score in ((0, 40.0), (12, 75.0), (45, 60.0), (90, 88.0))]
+    statistics = CapacityStatistics(anchor=start)
+    for index, (performed_at, score, weight) in enumerate(samples):
+        statistics.append(performed_at, f"attempt-{index}", score, {CapacityType.STRENGTH: weight})
+
+    now = start + timedelta(days=120)
+    assert statistics.value_at(CapacityType.STRENGTH, now) == pytest.approx(_direct_ema(samples, now))
+    assert statistics.value_at(CapacityType.WORK_CAPACITY, now) is None
+    assert statistics.count_since(now - timedelta(days=60)) == 1
+
+
+def test_statistics_reject_backdated_attempts() -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    statistics = CapacityStatistics(anchor=start)
+    statistics.append(start + timedelta(days=5), "attempt-b", 50.0, {CapacityType.STRENGTH: 1.0})
+
+    assert statistics.can_append(start + timedelta(days=6), "attempt-a")
+    assert statistics.can_append(start + timedelta(days=5), "attempt-c")
+    assert not statistics.can_append(start + timedelta(days=5), "attempt-a")
+    assert not statistics.can_append(start + timedelta(days=4), "attempt-z")
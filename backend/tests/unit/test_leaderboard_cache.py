@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.application.services.leaderboard_cache import LeaderboardResponseCache
+
+pytestmark = pytest.mark.unit
+
+
+def test_cache_serves_same_version_and_recomputes_on_version_change() -> None:
+    cache = LeaderboardResponseCache(max_entries=10)
+    calls: list[int] = []
+
+    def compute(version: int):
+        def _compute() -> tuple[int, dict]:
+            calls.append(version)
+            return version, {"version": version}
+
+        return _compute
+
+    assert cache.get_or_compute("board", 1, compute(1)) == {"version": 1}
+    assert cache.get_or_compute("board", 1, compute(1)) == {"version": 1}
+    assert cache.get_or_compute("board", 2, compute(2)) == {"version": 2}
+
+    assert calls == [1, 2]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_concurrent_misses_for_same_key_compute_once() -> None:
+    cache = LeaderboardResponseCache(max_entries=10)
+    calls: list[str] = []
+    barrier = threading.Barrier(4)
+    results: list[dict] = []
+
+    def compute() -> tuple[int, dict]:
+        calls.append("computed")
+        time.sleep(0.05)
+        return 1, {"entries": []}
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(cache.get_or_compute("board", 1, compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["computed"]
+    assert results == [{"entries": []}] * 4
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.adapters.outbound.persistence.models.enums import (
+    LeaderboardPeriod,
+    LeaderboardScope,
+    ScaleCode,
+)
+from src.application.services import leaderboard_index
+from src.application.services.leaderboard_index import (
+    LeaderboardCandidate,
+    LeaderboardIndex,
+    SortedKeys,
+    decode_cursor,
+    encode_cursor,
+)
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 1, 31, tzinfo=UTC)
+
+
+def _candidate(attempt_id: str, athlete_id: str, score_norm: float, days_ago: int = 0) -> LeaderboardCandidate:
+    return LeaderboardCandidate(
+        attempt_id=attempt_id,
+        athlete_id=athlete_id,
+        score_norm=score_norm,
+        performed_at=NOW - timedelta(days=days_ago),
+    )
+
+
+def _key(scope: LeaderboardScope, gym_id: str | None = None, period: LeaderboardPeriod = LeaderboardPeriod.ALL_TIME):
+    return ("workout-1", scope, gym_id, period, ScaleCode.RX)
+
+
+def test_board_keeps_best_per_athlete_and_falls_back_on_removal() -> None:
+    index = LeaderboardIndex()
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("a1", "athlete-a", 70.0), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("a2", "athlete-a", 90.0), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-b", _candidate("b1", "athlete-b", 80.0), NOW)
+
+    community = index.board(_key(LeaderboardScope.COMMUNITY))
+    assert community is not None
+    assert [item.attempt_id for item in community.entries()] == ["a2", "b1"]
+    assert community.rank_of("athlete-b") == 2
+
+    index.remove("workout-1", ScaleCode.RX, "athlete-a", "a2")
+
+    assert [item.attempt_id for item in community.entries()] == ["b1", "a1"]
+    assert community.rank_of("athlete-a") == 2
+
+
+def test_ties_rank_earlier_performance_first() -> None:
+    index = LeaderboardIndex()
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("late", "athlete-a", 80.0, days_ago=1), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("early", "athlete-b", 80.0, days_ago=3), NOW)
+
+    community = index.board(_key(LeaderboardScope.COMMUNITY))
+    assert community is not None
+    assert [item.attempt_id for item in community.entries()] == ["early", "late"]
+
+
+def test_gym_move_relocates_standing_between_gym_boards() -> None:
+    index = LeaderboardIndex()
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("a1", "athlete-a", 70.0), NOW)
+
+    index.move_athlete("athlete-a", "gym-b")
+
+    gym_a = index.board(_key(LeaderboardScope.GYM, "gym-a"))
+    gym_b = index.board(_key(LeaderboardScope.GYM, "gym-b"))
+    assert gym_a is not None and len(gym_a) == 0
+    assert gym_b is not None and gym_b.rank_of("athlete-a") == 1
+
+
+def test_cursor_pages_continue_after_last_returned_entry() -> None:
+    index = LeaderboardIndex()
+    for position in range(5):
+        index.add("workout-1", ScaleCode.RX, "gym-a", _candidate(f"a{position}", f"athlete-{position}", 90.0 - position), NOW)
+    community = index.board(_key(LeaderboardScope.COMMUNITY))
+    assert community is not None
+
+    first_page = community.page(0, 2)
+    offset = community.offset_after(decode_cursor(encode_cursor(first_page[-1])))
+
+    assert [item.athlete_id for item in first_page] == ["athlete-0", "athlete-1"]
+    assert [item.athlete_id for item in community.page(offset, 2)] == ["athlete-2", "athlete-3"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_d30_window_evicts_expired_days_and_falls_back_to_next_best() -> None:
+    index = LeaderboardIndex()
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("old-best", "athlete-a", 95.0, days_ago=29), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-a", _candidate("recent", "athlete-a", 60.0, days_ago=2), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-b", _candidate("b-old", "athlete-b", 80.0, days_ago=28), NOW)
+    index.add("workout-1", ScaleCode.RX, "gym-b", _candidate("expired", "athlete-c", 99.0, days_ago=31), NOW)
+    d30 = index.board(_key(LeaderboardScope.COMMUNITY, period=LeaderboardPeriod.D30))
+    all_time = index.board(_key(LeaderboardScope.COMMUNITY))
+    assert d30 is not None and all_time is not None
+    assert [item.attempt_id for item in d30.entries()] == ["old-best", "b-old"]
+
+    index.advance(NOW + timedelta(days=1, hours=12))
+
+    assert [item.attempt_id for item in d30.entries()] == ["b-old", "recent"]
+    gym_a = index.board(_key(LeaderboardScope.GYM, "gym-a", LeaderboardPeriod.D30))
+    assert gym_a is not None and [item.attempt_id for item in gym_a.entries()] == ["recent"]
+
+    index.advance(NOW + timedelta(days=3))
+
+    assert [item.attempt_id for item in d30.entries()] == ["recent"]
+    assert [item.attempt_id for item in all_time.entries()] == ["expired", "old-best", "b-old"]
+
+
+def test_sorted_keys_split_and_merge_blocks_keep_ranks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(leaderboard_index, "_BLOCK_LOAD", 2)
+    keys = SortedKeys()
+    expected = sorted((-float(score), NOW, f"athlete-{score:03d}") for score in range(40))
+    for key in reversed(expected):
+        keys.add(key)
+    for key in expected[::3]:
+        keys.discard(key)
+    keys.discard((1.0, NOW, "missing"))
+    remaining = [key for index, key in enumerate(expected) if index % 3]
+
+    assert len(keys) == len(remaining)
+    assert keys.slice(0, None) == remaining
+    assert keys.slice(5, 12) == remaining[5:12]
+    assert keys.bisect_left(remaining[10]) == 10
+    assert keys.bisect_right(remaining[10]) == 11
+    assert keys.bisect_right(expected[0]) == 0
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.adapters.outbound.auth.password_hasher import PasswordHasher
+
+pytestmark = pytest.mark.unit
+
+
+async def test_verify_async_checks_password_off_the_event_loop() -> None:
+    hasher = PasswordHasher(max_workers=2)
+    hashed = hasher.hash("Secret123!")
+
+    ok, wrong = await asyncio.gather(
+        hasher.verify_async("Secret123!", hashed),
+        hasher.verify_async("nope", hashed),
+    )
+
+    assert ok is True
+    assert wrong is False
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.application.services.refresh_token_store import RefreshTokenStore
+from src.application.services.runtime_service import RefreshTokenRecord
+
+pytestmark = pytest.mark.unit
+
+
+def _record(token_hash: str, *, created_at: datetime, ttl: timedelta) -> RefreshTokenRecord:
+    return RefreshTokenRecord(
+        id=f"id-{token_hash}",
+        user_id="user-1",
+        token_hash=token_hash,
+        expires_at=created_at + ttl,
+        revoked_at=None,
+        created_at=created_at,
+    )
+
+
+def test_store_looks_up_by_token_hash() -> None:
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    store = RefreshTokenStore()
+    record = _record("hash-a", created_at=now, ttl=timedelta(days=30))
+
+    store.add(record)
+
+    assert store.get("hash-a") is record
+    assert store.get("missing") is None
+    assert len(store) == 1
+
+
+def test_prune_evicts_expired_records_and_keeps_revoked_until_expiry() -> None:
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    store = RefreshTokenStore()
+    expired = _record("expired", created_at=now - timedelta(days=31), ttl=timedelta(days=30))
+    revoked = _record("revoked", created_at=now, ttl=timedelta(days=30))
+    live = _record("live", created_at=now, ttl=timedelta(days=30))
+    for record in (expired, revoked, live):
+        store.add(record)
+    store.revoke(revoked, now)
+
+    evicted = store.prune(now)
+
+    assert evicted == 1
+    assert len(store) == 2
+    assert store.get("live") is live
+    assert store.get("revoked") is revoked
+    assert store.live_for_user("user-1", now) == [live]
+    assert store.get("expired") is None
+
+    assert store.prune(now + timedelta(days=30)) == 2
+    assert len(store) == 0
@@ -14,6 +14,7 @@ import type {
   RefreshRequest,
   RefreshResponse,
   ScaleCode,
+  SessionDTO,
   SubmitResultRequest,
   UserRole,
   UserStatus,
@@ -52,6 +53,9 @@ export type LeaderboardQuery = {
   scaleCode: ScaleCode;
   scope: "COMMUNITY" | "GYM";
   period: "ALL_TIME" | "D30";
+  limit?: number;
+  offset?: number;
+  cursor?: string;
 };
 
 export type CoachOverviewDTO = {
@@ -82,6 +86,7 @@ export type CoachAthleteDetailDTO = {
 type ApiEndpoints = {
   login: string;
   refresh: string;
+  sessions: string;
   me: string;
   listMovements: string;
   listWorkouts: string;
@@ -109,6 +114,7 @@ type ApiEndpoints = {
 const DEFAULT_ENDPOINTS: ApiEndpoints = {
   login: "/auth/login",
   refresh: "/auth/refresh",
+  sessions: "/auth/sessions",
   me: "/me",
   listMovements: "/movements",
   listWorkouts: "/workouts",
@@ -171,6 +177,10 @@ export function createApi(options: CreateApiOptions) {
       return response;
     },
 
+    async listSessions(): Promise<SessionDTO[]> {
+      return http.request<SessionDTO[]>(endpoints.sessions);
+    },
+
     async me(): Promise<MeResponse> {
       return http.request<MeResponse>(endpoints.me);
     },
@@ -219,6 +229,9 @@ export function createApi(options: CreateApiOptions) {
         scope: query.scope,
         period: query.period,
       });
+      if (query.limit !== undefined) params.set("limit", String(query.limit));
+      if (query.offset !== undefined) params.set("offset", String(query.offset));
+      if (query.cursor !== undefined) params.set("cursor", query.cursor);
       return http.request<LeaderboardDTO>(`${endpoints.leaderboard}?${params.toString()}`);
     },
 
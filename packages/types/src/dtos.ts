@@ -36,6 +36,12 @@ export interface RefreshResponse {
   accessToken: string;
 }
 
+export interface SessionDTO {
+  id: string;
+  createdAt: string;
+  expiresAt: string;
+}
+
 export interface InviteCreateRequest {
   email: string;
   gymId: string;
@@ -267,4 +273,7 @@ export interface LeaderboardDTO {
   scaleCode: ScaleCode;
   entries: LeaderboardEntryDTO[];
   myRank?: number;
+  total: number;
+  nextCursor?: string;
+  neighbors: LeaderboardEntryDTO[];
 }